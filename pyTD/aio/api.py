@@ -0,0 +1,197 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import logging
+
+from pyTD.api import api as _api
+from pyTD.utils.decoders import loads
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiohttp
+    _CONNECTION_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+except ImportError:  # pragma: no cover
+    _CONNECTION_ERRORS = (asyncio.TimeoutError,)
+
+
+class AsyncResponse(object):
+    """
+    Buffered response of an asynchronous request. Exposes the attributes of
+    requests.Response used by pyTD so that responses may be checked and
+    decoded by the synchronous code paths.
+
+    Parameters
+    ----------
+    status_code: int
+        HTTP response code
+    content: bytes
+        Response body
+    url: str
+        Request URL
+    reason: str, optional
+        HTTP reason phrase
+    headers: dict, optional
+        Response headers
+    encoding: str, default "utf-8", optional
+        Encoding of the response body
+    """
+    def __init__(self, status_code, content, url, reason=None, headers=None,
+                 encoding="utf-8"):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.reason = reason
+        self.headers = headers or {}
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return loads(self.content)
+
+
+class api(_api):
+    """ Asynchronous user agent for authenticated TD Ameritrade HTTP requests
+
+    Accepts the same parameters as pyTD.api.api, except that ``session`` is
+    an aiohttp.ClientSession. If no session is passed, one is created on the
+    first request and closed by ``close``.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> from pyTD import aio
+    >>> async def main():
+    ...     async with aio.api(consumer_key="TEST@AMER.OAUTHAP",
+    ...                        callback_url="https://localhost:8080") as a:
+    ...         return await aio.Quotes("AAPL", api=a).execute()
+    >>> asyncio.get_event_loop().run_until_complete(main())
+    """
+    def __init__(self, options=None, **kwargs):
+        kwargs.update(options or {})
+        session = kwargs.pop("session", None)
+        super(api, self).__init__(**kwargs)
+        self.session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the aiohttp session if it was created by this api
+        """
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    @staticmethod
+    def _encode_params(params):
+        # aiohttp only accepts str, int, and float query values. As with
+        # requests, list values are sent as repeated keys
+        from multidict import MultiDict
+        encoded = MultiDict()
+        for key, values in params.items():
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            for value in values:
+                if value is None:
+                    continue
+                if isinstance(value, bool):
+                    value = "true" if value else "false"
+                elif not isinstance(value, (str, int, float)):
+                    value = str(value)
+                encoded.add(key, value)
+        return encoded
+
+    async def _send(self, method, url, headers, params, **kwargs):
+        session = self._get_session()
+        async with session.request(method, url, headers=headers,
+                                   params=self._encode_params(params),
+                                   **kwargs) as r:
+            content = await r.read()
+            return AsyncResponse(r.status, content, str(r.url),
+                                 reason=r.reason, headers=dict(r.headers),
+                                 encoding=r.get_encoding())
+
+    async def request(self, method, url, **kwargs):
+        status_check = kwargs.pop("status", None)
+        headers, params = self._prepare_request(method, url, kwargs)
+
+        retries = 0
+        replayed = False
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            error = response = None
+            try:
+                response = await self._send(method, url, headers, params,
+                                            **kwargs)
+            except _CONNECTION_ERRORS as e:
+                error = e
+            else:
+                if response.status_code == 200:
+                    break
+                if response.status_code == 401 and not replayed:
+                    loop = asyncio.get_event_loop()
+                    await loop.run_in_executor(None, self._reauthorize,
+                                               headers)
+                    replayed = True
+                    continue
+            if not self.retry_policy.should_retry(retries, response, error):
+                break
+            await asyncio.sleep(self.retry_policy.backoff(retries, response))
+            retries += 1
+        return self._finish_request(response, error, retries, status_check)
+
+
+__api__ = None
+
+
+def default_api():
+    """
+    Returns an asynchronous api sharing the credentials and token cache of
+    pyTD.api.default_api
+    """
+    global __api__
+    if __api__ is None:
+        from pyTD.api import default_api as _default_api
+        sync = _default_api()
+        __api__ = api(consumer_key=sync.consumer_key,
+                      callback_url=sync.callback_url,
+                      cache=sync.cache)
+    return __api__
@@ -0,0 +1,38 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pyTD.aio.resource import AsyncGet, async_auth_check
+from pyTD.instruments import base
+from pyTD.utils.exceptions import ResourceNotFound
+
+
+class Instruments(AsyncGet, base.Instruments):
+    """
+    Awaitable pyTD.instruments.Instruments
+    """
+    @async_auth_check
+    async def execute(self):
+        data = await self.get()
+        if not data:
+            raise ResourceNotFound("Instrument data for %s not"
+                                   " found." % self.symbol)
+        return self._output_format(data)
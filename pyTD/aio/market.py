@@ -0,0 +1,118 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import logging
+
+from pyTD.aio.resource import AsyncGet, async_auth_check, _gather_concurrent
+from pyTD.market import hours, movers, options, price_history, quotes
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
+
+logger = logging.getLogger(__name__)
+
+
+class MarketHours(AsyncGet, hours.MarketHours):
+    """
+    Awaitable pyTD.market.MarketHours
+    """
+    @async_auth_check
+    async def execute(self):
+        out = await self.get()
+        return self._output_format(out)
+
+
+class Movers(AsyncGet, movers.Movers):
+    """
+    Awaitable pyTD.market.Movers
+    """
+    @async_auth_check
+    async def execute(self):
+        out = await self.get()
+        return self._output_format(out)
+
+
+class Options(AsyncGet, options.Options):
+    """
+    Awaitable pyTD.market.Options
+    """
+    async def get(self):
+        if self.stream and self.output_format != 'raw':
+            response = await self.api.request("GET", url=self.url,
+                                              params=self.params)
+            return self._parse_chain(io.BytesIO(response.content))
+        return self._check_status(await super(Options, self).get())
+
+    @async_auth_check
+    async def execute(self):
+        out = await self.get()
+        return self._output_format(out)
+
+
+class PriceHistory(AsyncGet, price_history.PriceHistory):
+    """
+    Awaitable pyTD.market.PriceHistory. All symbols are retrieved
+    concurrently unless limited by ``max_workers``.
+    """
+    def __init__(self, symbols, **kwargs):
+        kwargs.setdefault("max_workers", None)
+        super(PriceHistory, self).__init__(symbols, **kwargs)
+
+    async def _fetch_task(self, task):
+        sym, start, end = task
+        if start is None:
+            return self._candles(sym,
+                                 await self.get(url=self.url.format(sym)))
+        return self._chunk(task, await self.get(
+            url=self.url.format(sym), params=self._range_params(start, end)))
+
+    @async_auth_check
+    async def execute(self):
+        tasks = self._tasks()
+        result, failures = await _gather_concurrent(
+            self._fetch_task, tasks, max_workers=self.max_workers,
+            catch=TDQueryError)
+        result, self.failures = self._stitch(tasks, result, failures)
+        return self._finish(result)
+
+
+class Quotes(AsyncGet, quotes.Quotes):
+    """
+    Awaitable pyTD.market.Quotes. All batches are retrieved concurrently
+    unless limited by ``max_workers``.
+    """
+    def __init__(self, symbols, **kwargs):
+        kwargs.setdefault("max_workers", None)
+        super(Quotes, self).__init__(symbols, **kwargs)
+
+    async def _fetch_batch(self, batch):
+        data = await self.get(params={"symbol": ','.join(batch)})
+        if not data:
+            raise ResourceNotFound(data, message="Quote for symbol %s not "
+                                   "found." % list(batch))
+        return data
+
+    @async_auth_check
+    async def execute(self):
+        result, self.failures = await _gather_concurrent(
+            self._fetch_batch, self.batches, max_workers=self.max_workers,
+            catch=TDQueryError)
+        return self._output_format(self._merge_batches(result))
@@ -0,0 +1,111 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+
+from functools import wraps
+
+from pyTD.aio.api import default_api
+from pyTD.auth import _authenticate
+from pyTD.compat import monotonic
+from pyTD.resource import Get
+from pyTD.utils.exceptions import TDQueryError
+
+
+def async_auth_check(func):
+    """
+    Awaitable counterpart of pyTD.auth.auth_check. Token refreshes are run
+    in the default executor so that the event loop is not blocked.
+    """
+    @wraps(func)
+    async def _authenticate_wrapper(self, *args, **kwargs):
+        if monotonic() >= self.api._auth_deadline:
+            if self.api.auth_valid is not True:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, _authenticate, self.api)
+            self.api._update_auth_deadline()
+        return await func(self, *args, **kwargs)
+    return _authenticate_wrapper
+
+
+async def _gather_concurrent(func, items, max_workers=None,
+                             catch=TDQueryError):
+    """
+    Awaits func for each item, at most max_workers at a time
+
+    Returns
+    -------
+    results: dict
+        Results of successful calls keyed by item, in input order
+    failures: dict
+        Exceptions raised by failed calls keyed by item, in input order
+    """
+    semaphore = asyncio.Semaphore(max_workers) if max_workers else None
+
+    async def call(item):
+        try:
+            if semaphore is None:
+                return True, await func(item)
+            async with semaphore:
+                return True, await func(item)
+        except catch as e:
+            return False, e
+
+    outcomes = await asyncio.gather(*[call(item) for item in items])
+    results = {}
+    failures = {}
+    for item, (ok, value) in zip(items, outcomes):
+        if ok:
+            results[item] = value
+        else:
+            failures[item] = value
+    return results, failures
+
+
+class AsyncGet(Get):
+    """
+    Awaitable GET requests. Requires an api from pyTD.aio.api.
+    """
+    def __init__(self, *args, **kwargs):
+        if kwargs.get("api") is None:
+            kwargs["api"] = default_api()
+        super(AsyncGet, self).__init__(*args, **kwargs)
+
+    async def get(self, url=None, params=None):
+        params = params or self.params
+        url = url or self.url
+
+        if getattr(self, "output_format", None) == "raw":
+            response = await self.api.request("GET", url=url, params=params)
+            return self._raw_response(response)
+
+        key, ttl = self._cache_lookup(url, params)
+        if key is not None:
+            data = self.api.response_cache.get(key)
+            if data is not None:
+                return data
+
+        response = await self.api.request("GET", url=url, params=params)
+        data = self._decode_response(response)
+        if key is not None:
+            self.api.response_cache.set(key, data, ttl)
+        return data
@@ -31,13 +31,18 @@ from pyTD import CONFIG_DIR
 from pyTD import DEFAULT_SSL_DIR
 
 from pyTD.auth import TDAuthManager
-from pyTD.cache import DiskCache, MemCache
+from pyTD.auth.refresher import TokenRefresher
+from pyTD.cache import DiskCache, MemCache, ResponseCache
+from pyTD.compat import monotonic
 from pyTD.utils import yn_require, bprint, gprint, rprint, _init_session
+from pyTD.utils.decoders import get_decoder
+from pyTD.utils.rate_limit import RateLimiter
+from pyTD.utils.retry import RetryPolicy
 from pyTD.utils.exceptions import (Redirection, ValidationError,
                                    AuthorizationError, ForbiddenAccess,
                                    ResourceNotFound, ClientError,
                                    ServerError, ConfigurationError,
-                                   SSLError, TDQueryError)
+                                   SSLError, TDQueryError, ConnectionError)
 
 
 logger = logging.getLogger(__name__)
@@ -96,11 +101,46 @@ class api(object):
     cache: MemCache or DiskCache, optional
         A pre-instantiated token cache
     retry_count: int, default 3, optional
-        Desired number of retries if a request fails
+        Desired number of retries if a request fails transiently
     pause: float, default 0.5, optional
-        Pause time between retry attempts
+        Base pause time between retry attempts, doubled after each retry
+    retry_policy: pyTD.utils.retry.RetryPolicy, optional
+        A pre-instantiated retry policy. Overrides retry_count and pause
     session: requests_cache.session, default None, optional
         A cached requests-cache session
+    decoder: str or callable, optional
+        JSON decoder of responses and the on-disk caches ("orjson", "ujson",
+        "json", or a function of the response bytes). Defaults to the
+        fastest installed decoder
+    rate_limit: int, optional
+        Maximum number of requests per rate_period. Requests are not rate
+        limited if not passed (TD Ameritrade allows 120 requests per minute)
+    rate_period: float, default 60, optional
+        Length in seconds of the rate limit window
+    rate_burst: int, optional
+        Maximum number of requests which may be made at once. Defaults to
+        rate_limit
+    rate_limit_shared: bool, default False, optional
+        Share the rate limit between all processes using the same consumer
+        key (through a file in the configuration directory)
+    rate_limiter: pyTD.utils.rate_limit.RateLimiter, optional
+        A pre-instantiated rate limiter. Overrides the other rate limit
+        parameters
+    auth_timeout: float or tuple, default (5, 30), optional
+        Connect and read timeouts in seconds of token requests, which are
+        made through the session and retried according to retry_policy
+    auth_margin: float, default 60, optional
+        Seconds before token expiry at which tokens are fully re-validated
+        (and refreshed if necessary) before a request
+    auto_refresh: bool, default False, optional
+        Renew the access token in a background thread ahead of its expiry
+    refresh_margin: float, default 300, optional
+        Seconds before the access token's expiry at which the background
+        refresher renews it. Should exceed auth_margin
+    response_cache: bool or pyTD.cache.ResponseCache, default None, optional
+        Cache of responses which rarely change (market hours, instruments,
+        and completed price history). Pass True for an in-memory cache with
+        default settings
     Examples
     --------
 
@@ -121,7 +161,22 @@ class api(object):
         # Optional optional parameters
         self.retry_count = kwargs.get("retry_count", 3)
         self.pause = kwargs.get("pause", 0.5)
+        self.retry_policy = kwargs.get("retry_policy")
+        if self.retry_policy is None:
+            self.retry_policy = RetryPolicy(total=self.retry_count,
+                                            backoff_factor=self.pause)
         self.session = _init_session(kwargs.get("session"))
+        self.decoder = get_decoder(kwargs.get("decoder"))
+        self.rate_limiter = kwargs.get("rate_limiter")
+        if self.rate_limiter is None and kwargs.get("rate_limit"):
+            path = None
+            if kwargs.get("rate_limit_shared", False) is True:
+                path = os.path.join(CONFIG_DIR,
+                                    "%s.ratelimit" % self.consumer_key)
+            self.rate_limiter = RateLimiter(kwargs["rate_limit"],
+                                            kwargs.get("rate_period", 60),
+                                            kwargs.get("rate_burst"),
+                                            path=path)
         tokens = kwargs.get("store_tokens", True)
         self.store_tokens = os.getenv("TD_STORE_TOKENS", tokens)
         if self.store_tokens in [True, "true", "True"]:
@@ -130,6 +185,11 @@ class api(object):
             self.store_tokens = False
         else:
             raise ValueError("Enter True or False for store_tokens.")
+        self.response_cache = kwargs.get("response_cache")
+        if self.response_cache is True:
+            self.response_cache = ResponseCache(decoder=self.decoder)
+        elif self.response_cache is False:
+            self.response_cache = None
         self.ssl_dir = DEFAULT_SSL_DIR
         self.ssl_cert_path = os.path.join(self.ssl_dir, 'cert.pem')
         self.ssl_key_path = os.path.join(self.ssl_dir, 'key.pem')
@@ -137,13 +197,22 @@ class api(object):
 
         if self.cache is None:
             if self.store_tokens is True:
-                self.cache = DiskCache(CONFIG_DIR, self.consumer_key)
+                self.cache = DiskCache(CONFIG_DIR, self.consumer_key,
+                                       decoder=self.decoder)
             else:
                 self.cache = MemCache()
 
         # Set up an authorization manager
         self.auth = TDAuthManager(self.cache, self.consumer_key,
-                                  self.callback_url)
+                                  self.callback_url, session=self.session,
+                                  timeout=kwargs.get("auth_timeout", (5, 30)),
+                                  retry_policy=self.retry_policy)
+        self.auth_margin = kwargs.get("auth_margin", 60)
+        self._auth_deadline = 0.0
+        self.refresh_margin = kwargs.get("refresh_margin", 300)
+        self.refresher = None
+        if kwargs.get("auto_refresh", False) is True:
+            self.start_refresher()
         # For debugging purposes
         self.options = kwargs
 
@@ -156,6 +225,26 @@ class api(object):
         refresh_token, access_token = self.auth.auth_via_browser()
         self.cache.refresh_token = refresh_token
         self.cache.access_token = access_token
+        self._auth_deadline = 0.0
+
+    def start_refresher(self):
+        """
+        Starts renewing the access token in a background thread,
+        refresh_margin seconds before it expires
+        """
+        if self.refresher is not None and self.refresher.is_alive():
+            return self.refresher
+        self.refresher = TokenRefresher(self, margin=self.refresh_margin)
+        self.refresher.start()
+        return self.refresher
+
+    def stop_refresher(self, timeout=None):
+        """
+        Stops the background access token refresher, if running
+        """
+        if self.refresher is not None:
+            self.refresher.stop(timeout)
+            self.refresher = None
 
     @property
     def refresh_token(self):
@@ -188,6 +277,20 @@ class api(object):
         """Validity of refresh token and access token"""
         return self.refresh_valid and self.access_valid
 
+    def _update_auth_deadline(self):
+        """
+        Caches the monotonic time until which the current tokens are known
+        to be valid (less auth_margin), so that authorization checks are a
+        single comparison until then
+        """
+        try:
+            expiry = min(self.refresh_token.expiry, self.access_token.expiry)
+        except (AttributeError, ConfigurationError):
+            self._auth_deadline = 0.0
+            return
+        remaining = expiry - time.time() - self.auth_margin
+        self._auth_deadline = monotonic() + max(remaining, 0.0)
+
     def __str__(self):
         FMT = "API(consumer_key: %s, callback_url: %s, config: %s)"
         return FMT % (self.consumer_key, self.callback_url, CONFIG_DIR)
@@ -201,28 +304,83 @@ class api(object):
                        os.getenv("TD_CONFIG_DIR"))
         return "%s%s" % (MSG, DBG)
 
-    def request(self, method, url, **kwargs):
+    def _prepare_request(self, method, url, kwargs):
+        """
+        Builds the headers and parameters of an authenticated request,
+        popping them from the passed keyword arguments
+        """
         headers = kwargs.pop("headers", {})
         headers.update({'authorization': self._auth_header})
         params = kwargs.pop("params", {})
         params.update({"apikey": self.consumer_key})
-        status_check = kwargs.pop("status", None)
 
         logger.debug("%s %s - %s" % (bprint("REQUEST:"), method, url))
         logger.debug("PARAMS: %s" % params)
 
         if "data" in kwargs:
             logger.debug("BODY: %s" % kwargs["data"])
+        return headers, params
 
-        # Try 3 times to obtain a response with a good status code
-        for i in range(self.retry_count+1):
-            response = self.session.request(method, url, headers=headers,
-                                            params=params, **kwargs)
-            if response.status_code == requests.codes.ok:
-                return self.handle_response(response)
-            time.sleep(self.pause)
+    def request(self, method, url, **kwargs):
+        status_check = kwargs.pop("status", None)
+        headers, params = self._prepare_request(method, url, kwargs)
+
+        retries = 0
+        replayed = False
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            error = response = None
+            try:
+                response = self.session.request(method, url, headers=headers,
+                                                params=params, **kwargs)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                error = e
+            else:
+                if response.status_code == requests.codes.ok:
+                    break
+                if response.status_code == 401 and not replayed:
+                    # Replay once with a refreshed access token
+                    self._reauthorize(headers)
+                    replayed = True
+                    continue
+            if not self.retry_policy.should_retry(retries, response, error):
+                break
+            wait = self.retry_policy.backoff(retries, response)
+            logger.debug("Retrying request in %.3f seconds." % wait)
+            time.sleep(wait)
+            retries += 1
+        return self._finish_request(response, error, retries, status_check)
+
+    def _reauthorize(self, headers):
+        """
+        Refreshes the access token after a request made with ``headers`` was
+        rejected with a 401 and updates their authorization header.
 
-        # Return the failed response anyway
+        If the cache already holds a newer token than the one sent, it is
+        used as is. Otherwise the token is refreshed through the auth
+        manager, which coalesces concurrent refreshes of the same token into
+        one.
+        """
+        current = self.cache.access_token
+        if headers.get("authorization") == "Bearer %s" % current.token:
+            logger.debug("Access token rejected. Refreshing.")
+            current = self.auth.refresh_access_token(stale=current)
+        self._update_auth_deadline()
+        headers["authorization"] = "Bearer %s" % current.token
+
+    def _finish_request(self, response, error, retries, status_check=None):
+        """
+        Handles the last attempt of a request, recording the number of
+        retries made on the response as ``retries``
+        """
+        if error is not None:
+            raise ConnectionError(message="Request failed after %d retries: "
+                                  "%s" % (retries, error))
+        if retries:
+            logger.debug("Request completed after %d retries." % retries)
+        response.retries = retries
         return self.handle_response(response, status_check)
 
     def _check_status_codes(self, response):
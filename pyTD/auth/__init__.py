@@ -27,7 +27,9 @@ import logging
 from functools import wraps
 
 from pyTD.auth.manager import TDAuthManager
+from pyTD.auth.refresher import TokenRefresher
 from pyTD.auth.server import TDAuthServer
+from pyTD.compat import monotonic
 from pyTD.utils import yn_require
 from pyTD.utils.exceptions import AuthorizationError
 
@@ -35,26 +37,39 @@ from pyTD.utils.exceptions import AuthorizationError
 logger = logging.getLogger(__name__)
 
 
+def _authenticate(api):
+    """
+    Obtains new tokens for an api whose tokens are not valid, refreshing the
+    access token or prompting for a new refresh token as necessary
+
+    Raises
+    ------
+    AuthorizationError
+        If valid tokens could not be obtained
+    """
+    if api.refresh_valid is False:
+        logger.warning("Need new refresh token.")
+        choice = yn_require("Would you like to authorize a new "
+                            "refresh token?")
+        if choice is True:
+            api.refresh_auth()
+        else:
+            raise AuthorizationError("Refresh token "
+                                     "needed for access.")
+    else:
+        api.auth.refresh_access_token()
+    if api.auth_valid is not True:
+        raise AuthorizationError("Authorization could not be "
+                                 "completed.")
+
+
 def auth_check(func):
     @wraps(func)
     def _authenticate_wrapper(self, *args, **kwargs):
-        if self.api.auth_valid is True:
-            return func(self, *args, **kwargs)
-        else:
-            if self.api.refresh_valid is False:
-                logger.warning("Need new refresh token.")
-                choice = yn_require("Would you like to authorize a new "
-                                    "refresh token?")
-                if choice is True:
-                    self.api.refresh_auth()
-                else:
-                    raise AuthorizationError("Refresh token "
-                                             "needed for access.")
-            else:
-                self.api.auth.refresh_access_token()
-        if self.api.auth_valid is True:
-            return func(self, *args, **kwargs)
-        else:
-            raise AuthorizationError("Authorization could not be "
-                                     "completed.")
+        # Tokens are only validated when close to (or past) their expiry
+        if monotonic() >= self.api._auth_deadline:
+            if self.api.auth_valid is not True:
+                _authenticate(self.api)
+            self.api._update_auth_deadline()
+        return func(self, *args, **kwargs)
     return _authenticate_wrapper
@@ -0,0 +1,199 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import json
+import logging
+import os
+import socket
+
+try:
+    from socketserver import ThreadingMixIn, StreamRequestHandler
+    import socketserver
+except ImportError:  # pragma: no cover
+    from SocketServer import ThreadingMixIn, StreamRequestHandler
+    import SocketServer as socketserver
+
+from pyTD import CONFIG_DIR
+from pyTD.auth.refresher import TokenRefresher
+from pyTD.auth.tokens import AccessToken
+from pyTD.utils.exceptions import AuthorizationError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+# socketserver only defines UnixStreamServer on platforms with Unix domain
+# sockets
+if hasattr(socket, "AF_UNIX"):
+    UnixStreamServer = socketserver.UnixStreamServer
+else:  # pragma: no cover
+    class UnixStreamServer(object):
+        def __init__(self, *args, **kwargs):
+            raise ConfigurationError("The token broker requires Unix domain "
+                                     "sockets, which are not available on "
+                                     "this platform.")
+
+DEFAULT_SOCKET = os.path.join(CONFIG_DIR, "broker.sock")
+
+
+class _BrokerHandler(StreamRequestHandler):
+    """
+    Serves JSON requests, one per line, for as long as the client keeps the
+    connection open
+    """
+    def handle(self):
+        for line in iter(self.rfile.readline, b""):
+            try:
+                reply = self.server.dispatch(json.loads(line.decode("utf-8")))
+            except Exception as e:
+                logger.warning("Token broker request failed: %s" % e)
+                reply = {"error": str(e)}
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class TokenBroker(ThreadingMixIn, UnixStreamServer):
+    """
+    Token broker serving an api's access token to other processes over a
+    Unix domain socket. The broker holds the refresh token and renews the
+    access token in the background, so that clients (see
+    pyTD.cache.BrokerCache) start with a valid access token and never
+    request tokens themselves.
+
+    Requests and replies are JSON objects, one per line. ``{"op": "token"}``
+    returns the current tokens and ``{"op": "refresh", "stale": token}``
+    replaces an access token rejected by TD Ameritrade. The value of the
+    refresh token is never sent.
+
+    Parameters
+    ----------
+    path: str
+        Path of the socket. Only the owner of the broker process may connect
+    api: pyTD.api.api
+        The api whose tokens are served
+    refresh_margin: float, default 300, optional
+        Seconds before the access token's expiry at which it is renewed
+
+    Usage
+    -----
+
+        >>> broker = TokenBroker("~/.tdm/broker.sock", api)
+        >>> broker.serve_forever()
+
+    Or from the command line:
+
+        $ python -m pyTD.auth.broker --socket ~/.tdm/broker.sock
+    """
+    daemon_threads = True
+
+    def __init__(self, path, api, refresh_margin=300):
+        self.path = os.path.expanduser(path)
+        self.api = api
+        # Remove the socket of a broker which did not shut down cleanly
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        UnixStreamServer.__init__(self, self.path, _BrokerHandler)
+        os.chmod(self.path, 0o600)
+        self.refresher = TokenRefresher(api, margin=refresh_margin)
+
+    def serve_forever(self, poll_interval=0.5):
+        if not self.refresher.is_alive():
+            self.refresher.start()
+        logger.info("Token broker listening on %s" % self.path)
+        UnixStreamServer.serve_forever(self, poll_interval)
+
+    def server_close(self):
+        self.refresher.stop()
+        UnixStreamServer.server_close(self)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def dispatch(self, request):
+        """
+        Handles a request from a client
+
+        Parameters
+        ----------
+        request: dict
+            The decoded request
+
+        Returns
+        -------
+        reply: dict
+            The current refresh token (without its value) and access token
+        """
+        op = request.get("op")
+        if op == "token":
+            self._ensure_access_token()
+        elif op == "refresh":
+            stale = AccessToken(token=request["stale"], access_time=0,
+                                expires_in=0)
+            self.api.auth.refresh_access_token(stale=stale)
+        else:
+            raise ValueError("Unknown operation: %s" % op)
+        self.api._update_auth_deadline()
+        refresh_token = self.api.refresh_token.__dict__()
+        refresh_token["token"] = ""
+        return {"refresh_token": refresh_token,
+                "access_token": self.api.access_token.__dict__()}
+
+    def _ensure_access_token(self):
+        if self.api.access_valid is True:
+            return
+        if self.api.refresh_valid is False:
+            raise AuthorizationError("Refresh token is not valid.")
+        self.api.auth.refresh_access_token()
+
+
+def main(argv=None):
+    """
+    Runs a token broker for the default api (configured through the
+    TD_CONSUMER_KEY and TD_CALLBACK_URL environment variables) or the
+    passed credentials
+    """
+    from pyTD.api import api, default_api
+
+    parser = argparse.ArgumentParser(description="pyTD token broker")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help="path of the socket")
+    parser.add_argument("--consumer-key", help="consumer key")
+    parser.add_argument("--callback-url", help="callback URL")
+    parser.add_argument("--refresh-margin", type=float, default=300,
+                        help="seconds before expiry at which to refresh "
+                        "the access token")
+    args = parser.parse_args(argv)
+
+    if args.consumer_key:
+        a = api(consumer_key=args.consumer_key,
+                callback_url=args.callback_url)
+    else:
+        a = default_api()
+    broker = TokenBroker(args.socket, a, refresh_margin=args.refresh_margin)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -23,12 +23,16 @@
 import datetime
 import logging
 import requests
+import threading
+import time
 import webbrowser
 
 from pyTD.auth.server import TDAuthServer
 from pyTD.auth.tokens import RefreshToken, AccessToken
-from pyTD.utils import to_timestamp
-from pyTD.utils.exceptions import AuthorizationError
+from pyTD.compat import monotonic
+from pyTD.utils import to_timestamp, _init_session
+from pyTD.utils.exceptions import AuthorizationError, ConnectionError
+from pyTD.utils.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +48,10 @@ class TDAuthManager(object):
         An authentication server instance which can be started and stopped for
         handling authentication redirects.
     """
-    def __init__(self, token_cache, consumer_key, callback_url):
+    TOKEN_URL = "https://api.tdameritrade.com/v1/oauth2/token"
+
+    def __init__(self, token_cache, consumer_key, callback_url, session=None,
+                 timeout=(5, 30), retry_policy=None):
         """
         Initialize the class
 
@@ -56,11 +63,34 @@ class TDAuthManager(object):
             Client OAuth ID
         callback_url: str
             Client Redirect URI
+        session: requests.Session, optional
+            Session used for token requests. A new session is created if not
+            passed
+        timeout: float or tuple, default (5, 30), optional
+            Connect and read timeouts of token requests in seconds
+        retry_policy: pyTD.utils.retry.RetryPolicy, optional
+            Retry policy for token requests. Defaults to two retries
         """
         self.cache = token_cache
         self.consumer_key = consumer_key
         self.callback_url = callback_url
+        self.session = _init_session(session)
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy(total=2)
         self.auth_server = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"refreshes": 0, "failures": 0, "retries": 0,
+                       "total_time": 0.0, "last_duration": None}
+
+    @property
+    def stats(self):
+        """
+        Access token refresh metrics: the number of refreshes, failed
+        refreshes and retries, and the total and last durations of
+        refreshes in seconds
+        """
+        with self._stats_lock:
+            return dict(self._stats)
 
     @property
     def access_token(self):
@@ -106,27 +136,57 @@ class TDAuthManager(object):
         webbrowser.open(url, new=2)
         return True
 
-    def refresh_access_token(self):
+    def refresh_access_token(self, stale=None):
         """
         Attempts to refresh access token if current is not valid.
 
-        Updates the cache if new token is received.
+        Updates the cache if new token is received. Refreshes are serialized
+        through the cache's refresh lock: if, once the lock is acquired, the
+        cache holds a valid access token other than the stale one (because
+        another thread or process refreshed it in the meantime), that token
+        is reused rather than requesting a new one. The refresh is delegated
+        to caches whose tokens are managed externally (see BrokerCache).
+
+        Parameters
+        ----------
+        stale: AccessToken, optional
+            The access token to be replaced. Defaults to the access token in
+            the cache when called
+
+        Returns
+        -------
+        access_token: AccessToken
+            The new (or reused) access token
 
         Raises
         ------
         AuthorizationError
             If the access token is not successfully refreshed
         """
+        if stale is None:
+            stale = self.cache.access_token
+        if self.cache.managed:
+            return self.cache.refresh(stale)
+        with self.cache.refresh_lock():
+            current = self.cache.access_token
+            if current.valid and current.token != stale.token:
+                logger.debug("Access token already refreshed. Reusing.")
+                return current
+            access_token = self._request_access_token()
+            self.cache.access_token = access_token
+        return access_token
+
+    def _request_access_token(self):
         if self.cache.refresh_token.valid is False:
             raise AuthorizationError("Refresh token is not valid.")
         logger.debug("Attempting to refresh access token...")
-        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         data = {'grant_type': 'refresh_token',
                 'refresh_token': self.cache.refresh_token.token,
                 'client_id': self.consumer_key}
+        start = monotonic()
+        retries = 0
         try:
-            authReply = requests.post('https://api.tdameritrade.com/v1/oauth2/'
-                                      'token', headers=headers, data=data)
+            authReply, retries = self._post_token(data)
             now = to_timestamp(datetime.datetime.now())
             if authReply.status_code == 400:
                 raise AuthorizationError("Could not refresh access token.")
@@ -136,11 +196,61 @@ class TDAuthManager(object):
             expires_in = json_data["expires_in"]
         except (KeyError, ValueError):
             logger.error("Error retrieving access token.")
+            self._record(start, retries, failed=True)
             raise AuthorizationError("Error retrieving access token.")
+        except Exception:
+            self._record(start, retries, failed=True)
+            raise
         access_token = AccessToken(token=token, access_time=now,
                                    expires_in=expires_in)
-        logger.debug("Successfully refreshed access token.")
-        self.cache.access_token = access_token
+        duration = self._record(start, retries)
+        logger.debug("Successfully refreshed access token in %.3f seconds."
+                     % duration)
+        return access_token
+
+    def _post_token(self, data):
+        """
+        Posts a token request through the session, retrying transient
+        failures according to the retry policy
+
+        Returns
+        -------
+        (response, retries): tuple
+
+        Raises
+        ------
+        ConnectionError
+            If the request could not be completed
+        """
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        retries = 0
+        while True:
+            error = response = None
+            try:
+                response = self.session.request("POST", self.TOKEN_URL,
+                                                headers=headers, data=data,
+                                                timeout=self.timeout)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                error = e
+            if not self.retry_policy.should_retry(retries, response, error):
+                break
+            time.sleep(self.retry_policy.backoff(retries, response))
+            retries += 1
+        if error is not None:
+            raise ConnectionError(message="Token request failed after %d "
+                                  "retries: %s" % (retries, error))
+        return response, retries
+
+    def _record(self, start, retries, failed=False):
+        duration = monotonic() - start
+        with self._stats_lock:
+            self._stats["refreshes"] += 1
+            self._stats["failures"] += failed
+            self._stats["retries"] += retries
+            self._stats["total_time"] += duration
+            self._stats["last_duration"] = duration
+        return duration
 
     def _start_auth_server(self):
         logger.info("Starting authorization server")
@@ -148,7 +258,9 @@ class TDAuthManager(object):
         # Return if server is already running
         if self.auth_server is not None:
             return
-        self.auth_server = TDAuthServer(self.consumer_key, self.callback_url)
+        self.auth_server = TDAuthServer(self.consumer_key, self.callback_url,
+                                        session=self.session,
+                                        timeout=self.timeout)
 
     def _stop_auth_server(self):
         logger.info("Shutting down authorization server")
@@ -0,0 +1,101 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRefresher(threading.Thread):
+    """
+    Daemon thread which renews an api's access token ahead of its expiry,
+    so that requests never wait on a token refresh.
+
+    Parameters
+    ----------
+    api: pyTD.api.api
+        The api whose access token should be kept fresh
+    margin: float, default 300, optional
+        Seconds before the access token's expiry at which to refresh it
+    retry_interval: float, default 30, optional
+        Seconds to wait before trying again after a failed refresh
+
+    Usage
+    -----
+
+        >>> refresher = TokenRefresher(api, margin=300)
+        >>> refresher.start()
+        >>> refresher.stop()
+    """
+    def __init__(self, api, margin=300, retry_interval=30):
+        super(TokenRefresher, self).__init__(name="pyTD-token-refresher")
+        self.daemon = True
+        self.api = api
+        self.margin = margin
+        self.retry_interval = retry_interval
+        self._halt = threading.Event()
+
+    def seconds_until_refresh(self):
+        """Seconds until the access token should be refreshed"""
+        token = self.api.access_token
+        if token.valid is False:
+            return 0.0
+        return max(token.expiry - self.margin - time.time(), 0.0)
+
+    def refresh(self):
+        """
+        Refreshes the access token and extends the api's authorization
+        deadline
+        """
+        self.api.auth.refresh_access_token()
+        self.api._update_auth_deadline()
+        logger.debug("Access token refreshed in the background.")
+
+    def run(self):
+        while not self._halt.is_set():
+            wait = self.seconds_until_refresh()
+            if wait > 0:
+                # The token may have been refreshed elsewhere in the meantime
+                self._halt.wait(wait)
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Background access token refresh failed: %s. "
+                               "Retrying in %s seconds." %
+                               (e, self.retry_interval))
+                self._halt.wait(self.retry_interval)
+
+    def stop(self, timeout=None):
+        """
+        Stops the refresher
+
+        Parameters
+        ----------
+        timeout: float, optional
+            Seconds to wait for the thread to exit
+        """
+        self._halt.set()
+        if self.is_alive():
+            self.join(timeout)
@@ -25,13 +25,12 @@ import datetime
 import json
 import logging
 import os
-import requests
 import ssl
 
 from pyTD import BASE_AUTH_URL, DEFAULT_SSL_DIR, PACKAGE_DIR
 from pyTD.compat import HTTPServer, BaseHTTPRequestHandler
 from pyTD.compat import urlparse, urlencode, parse_qs
-from pyTD.utils import to_timestamp
+from pyTD.utils import to_timestamp, _init_session
 from pyTD.utils.exceptions import AuthorizationError
 
 logger = logging.getLogger(__name__)
@@ -78,8 +77,9 @@ class Handler(BaseHTTPRequestHandler):
                     'client_id': self.server.consumer_key,
                     'redirect_uri': self.server.callback_url}
             now = to_timestamp(datetime.datetime.now())
-            authReply = requests.post('https://api.tdameritrade.com/v1/oauth2/'
-                                      'token', headers=headers, data=data)
+            authReply = self.server.session.request(
+                "POST", 'https://api.tdameritrade.com/v1/oauth2/token',
+                headers=headers, data=data, timeout=self.server.timeout)
             try:
                 json_data = authReply.json()
                 json_data["access_time"] = now
@@ -105,10 +105,26 @@ class Handler(BaseHTTPRequestHandler):
 class TDAuthServer(HTTPServer):
     """
     HTTP Server to handle authorization
+
+    Parameters
+    ----------
+    consumer_key: str
+        Client OAuth ID
+    callback_url: str
+        Client Redirect URI
+    retry_count: int, default 3, optional
+        Number of requests to handle while waiting for tokens
+    session: requests.Session, optional
+        Session used to exchange the authorization code for tokens
+    timeout: float or tuple, default (5, 30), optional
+        Connect and read timeouts of the token request in seconds
     """
-    def __init__(self, consumer_key, callback_url, retry_count=3):
+    def __init__(self, consumer_key, callback_url, retry_count=3,
+                 session=None, timeout=(5, 30)):
         self.consumer_key = consumer_key
         self.callback_url = callback_url
+        self.session = _init_session(session)
+        self.timeout = timeout
         self.parsed_url = urlparse(self.callback_url)
         self.retry_count = retry_count
         self.auth_code = None
@@ -22,5 +22,9 @@
 
 # flake8: noqa
 
+from pyTD.cache.broker_cache import BrokerCache
+from pyTD.cache.candle_store import CandleStore
 from pyTD.cache.disk_cache import DiskCache
 from pyTD.cache.mem_cache import MemCache
+from pyTD.cache.response_cache import ResponseCache
+from pyTD.cache.sql_cache import SQLCache
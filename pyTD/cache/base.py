@@ -20,6 +20,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import threading
+
 from pyTD.auth.tokens import EmptyToken
 
 
@@ -39,13 +41,40 @@ def surface_property(api_property_name, docstring=None):
 class TokenCache(object):
     """
     Base class for auth token caches
+
+    Attributes
+    ----------
+    managed: bool
+        Whether access tokens are refreshed by an external process (through
+        ``refresh``) rather than by the auth manager
     """
     refresh_token = surface_property("refresh_token")
     access_token = surface_property("access_token")
+    managed = False
 
     def __init__(self):
+        self._refresh_lock = threading.Lock()
         self._create()
 
+    def refresh_lock(self):
+        """
+        Lock held while refreshing the access token, so that only one
+        refresh happens at a time for the tokens in this cache
+        """
+        return self._refresh_lock
+
+    def refresh(self, stale):
+        """
+        Obtains a new access token from the external process managing the
+        tokens of this cache
+
+        Parameters
+        ----------
+        stale: AccessToken
+            The access token to be replaced
+        """
+        raise NotImplementedError
+
     def clear(self):
         raise NotImplementedError
 
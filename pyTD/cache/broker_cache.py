@@ -0,0 +1,144 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import logging
+import os
+import socket
+import threading
+
+from pyTD.auth.tokens import AccessToken, RefreshToken
+from pyTD.cache.base import TokenCache
+from pyTD.utils.exceptions import (AuthorizationError, ConfigurationError,
+                                   ConnectionError)
+
+logger = logging.getLogger(__name__)
+
+
+class BrokerCache(TokenCache):
+    """
+    Token cache whose tokens are served by a token broker
+    (pyTD.auth.broker.TokenBroker) over a Unix domain socket. Tokens are
+    kept in memory until the access token expires, and refreshes are
+    delegated to the broker, so that processes using this cache never
+    request tokens themselves.
+
+    Attributes
+    ----------
+    path: str
+        Path of the broker's socket
+    timeout: float, default 5, optional
+        Seconds to wait for a reply from the broker
+
+    Usage
+    -----
+
+        >>> c = BrokerCache("~/.tdm/broker.sock")
+        >>> a = api(consumer_key=..., callback_url=..., cache=c)
+    """
+    managed = True
+
+    def __init__(self, path, timeout=5):
+        if not hasattr(socket, "AF_UNIX"):  # pragma: no cover
+            raise ConfigurationError("BrokerCache requires Unix domain "
+                                     "sockets, which are not available on "
+                                     "this platform.")
+        self.path = os.path.expanduser(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        super(BrokerCache, self).__init__()
+
+    def __repr__(self):
+        return "BrokerCache(path= %s)" % self.path
+
+    def clear(self):
+        """
+        Discards the tokens held in memory
+        """
+        return self._create()
+
+    def refresh(self, stale):
+        return self._call({"op": "refresh", "stale": stale.token})[
+            "access_token"]
+
+    def _create(self):
+        self._tokens = None
+
+    def _exists(self):
+        return os.path.exists(self.path)
+
+    def _get(self, value):
+        tokens = self._tokens
+        if tokens is None or not tokens["access_token"].valid:
+            tokens = self._call({"op": "token"})
+        return tokens[value]
+
+    def _set(self, attr, payload):
+        raise ConfigurationError("Tokens of a BrokerCache are managed by "
+                                 "the token broker.")
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except socket.error:
+            sock.close()
+            raise
+        # Connections are kept open and reused by each thread
+        self._local.conn = (sock, sock.makefile("rb"))
+        return self._local.conn
+
+    def _disconnect(self):
+        sock, reader = self._local.conn
+        self._local.conn = None
+        reader.close()
+        sock.close()
+
+    def _send(self, request):
+        sock, reader = getattr(self._local, "conn", None) or self._connect()
+        try:
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            line = reader.readline()
+            if not line:
+                raise socket.error("Connection closed by broker.")
+        except socket.error:
+            self._disconnect()
+            raise
+        return json.loads(line.decode("utf-8"))
+
+    def _call(self, request):
+        try:
+            try:
+                reply = self._send(request)
+            except socket.error:
+                # Reconnect once, in case the broker was restarted
+                reply = self._send(request)
+        except socket.error as e:
+            raise ConnectionError(message="Token broker at %s is not "
+                                  "available: %s" % (self.path, e))
+        if "error" in reply:
+            raise AuthorizationError("Token broker: %s" % reply["error"])
+        tokens = {"refresh_token": RefreshToken(reply["refresh_token"]),
+                  "access_token": AccessToken(reply["access_token"])}
+        self._tokens = tokens
+        return tokens
@@ -0,0 +1,287 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from pyTD.compat import replace
+from pyTD.utils.lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Layout of stored candles. Times are epoch milliseconds
+CANDLE_DTYPE = np.dtype([("datetime", "i8"), ("open", "f8"), ("high", "f8"),
+                         ("low", "f8"), ("close", "f8"), ("volume", "i8")])
+
+
+def _candles_to_records(candles):
+    """
+    Converts candles as returned by the Get Price History endpoint to a
+    structured array of CANDLE_DTYPE
+    """
+    count = len(candles)
+    out = np.empty(count, dtype=CANDLE_DTYPE)
+    for name in CANDLE_DTYPE.names:
+        out[name] = np.fromiter((c[name] for c in candles),
+                                dtype=CANDLE_DTYPE[name], count=count)
+    return out
+
+
+def _merge_ranges(ranges):
+    """
+    Merges overlapping or adjacent [start, end] millisecond ranges
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class CandleStore(object):
+    """
+    Local store of price history candles, which lets PriceHistory only
+    request the parts of a date range which have not been retrieved before.
+
+    Candles are partitioned by symbol and frequency. Each partition is a
+    directory holding the candles sorted by time in a numpy file
+    (``candles.npy``, read memory-mapped) and the time ranges it covers in
+    a JSON sidecar (``ranges.json``). Coverage never extends past the most
+    recent midnight of the exchange's time zone, so candles of the current
+    session are always requested again.
+
+    Updates are made under an advisory lock (``.lock``) per partition and
+    written to temporary files which atomically replace the partition's
+    files, so a store may be shared by several processes.
+
+    Parameters
+    ----------
+    path: str
+        Directory of the store, created if it does not exist
+    tz: str, default "America/New_York", optional
+        Time zone of the exchange, whose midnight ends the coverage of the
+        store
+
+    Usage
+    -----
+
+        >>> store = CandleStore("~/.tdm/candles")
+        >>> get_price_history("AAPL", frequency_type="minute",
+        ...                   start_date="2018-01-01", end_date="2018-06-30",
+        ...                   candle_store=store)
+    """
+    def __init__(self, path, tz="America/New_York"):
+        self.path = os.path.expanduser(path)
+        self.tz = tz
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def __repr__(self):
+        return "CandleStore(path = %s)" % self.path
+
+    def partition(self, symbol, frequency):
+        """
+        Directory of a symbol and frequency's partition
+
+        Parameters
+        ----------
+        symbol: str
+            Symbol
+        frequency: str
+            Frequency key (e.g. "minute-1-ext")
+        """
+        def escape(name):
+            return re.sub(r"[^A-Za-z0-9.$_-]",
+                          lambda m: "%%%02X" % ord(m.group()), name)
+        return os.path.join(self.path, escape(str(symbol).upper()),
+                            escape(frequency))
+
+    def ranges(self, symbol, frequency):
+        """
+        Merged [start, end] ranges of epoch milliseconds held by a partition
+        """
+        path = os.path.join(self.partition(symbol, frequency), "ranges.json")
+        try:
+            with open(path) as f:
+                return [list(r) for r in json.load(f)]
+        except (IOError, OSError, ValueError):
+            return []
+
+    def missing(self, symbol, frequency, start, end):
+        """
+        Gaps of a date range which are not held by a partition
+
+        Parameters
+        ----------
+        symbol: str
+            Symbol
+        frequency: str
+            Frequency key
+        start: int
+            Start of the range in epoch milliseconds
+        end: int
+            End of the range in epoch milliseconds
+
+        Returns
+        -------
+        gaps: list
+            (start, end) tuples of epoch milliseconds, in order
+        """
+        gaps = []
+        for r_start, r_end in self.ranges(symbol, frequency):
+            if r_end < start:
+                continue
+            if r_start > end:
+                break
+            if r_start > start:
+                gaps.append((start, r_start - 1))
+            start = r_end + 1
+            if start > end:
+                return gaps
+        gaps.append((start, end))
+        return gaps
+
+    def read(self, symbol, frequency, start, end):
+        """
+        Stored candles of a date range
+
+        Parameters
+        ----------
+        symbol: str
+            Symbol
+        frequency: str
+            Frequency key
+        start: int
+            Start of the range in epoch milliseconds
+        end: int
+            End of the range in epoch milliseconds
+
+        Returns
+        -------
+        candles: numpy.ndarray
+            Structured array of CANDLE_DTYPE sorted by time
+        """
+        path = os.path.join(self.partition(symbol, frequency), "candles.npy")
+        try:
+            candles = np.load(path, mmap_mode="r")
+        except (IOError, OSError, ValueError):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        times = candles["datetime"]
+        lo = np.searchsorted(times, start, side="left")
+        hi = np.searchsorted(times, end, side="right")
+        return np.array(candles[lo:hi])
+
+    def update(self, symbol, frequency, chunks):
+        """
+        Merges candles retrieved for one or more date ranges into a
+        partition, which is written once. Candles replace stored candles of
+        the same time.
+
+        Parameters
+        ----------
+        symbol: str
+            Symbol
+        frequency: str
+            Frequency key
+        chunks: list
+            (start, end, candles) of each retrieved range, where start and
+            end are epoch milliseconds and candles are as returned by the Get
+            Price History endpoint, or a structured array of CANDLE_DTYPE
+        """
+        if not chunks:
+            return
+        records = [c if isinstance(c, np.ndarray) else _candles_to_records(c)
+                   for _, _, c in chunks]
+        midnight = self._midnight()
+        covered = [[start, min(end, midnight - 1)] for start, end, _ in chunks
+                   if start < midnight]
+        part = self.partition(symbol, frequency)
+        if not os.path.isdir(part):
+            try:
+                os.makedirs(part)
+            except OSError:
+                # Created by another process
+                if not os.path.isdir(part):
+                    raise
+        with FileLock(os.path.join(part, ".lock")):
+            stored = self.read(symbol, frequency, -2 ** 62, 2 ** 62)
+            merged = np.concatenate(records + [stored])
+            # First occurrences, i.e. the new candles, are kept
+            _, keep = np.unique(merged["datetime"], return_index=True)
+            self._write(part, "candles.npy", merged[keep])
+            ranges = _merge_ranges(self.ranges(symbol, frequency) + covered)
+            self._write(part, "ranges.json", ranges)
+
+    def _midnight(self, now=None):
+        # Most recent midnight of the exchange in epoch milliseconds, as of
+        # now (epoch milliseconds) if passed
+        if now is None:
+            now = pd.Timestamp.now(tz=self.tz)
+        else:
+            now = pd.Timestamp(now, unit="ms", tz="UTC").tz_convert(self.tz)
+        return now.normalize().value // 10 ** 6
+
+    def clear(self, symbol=None):
+        """
+        Removes stored candles
+
+        Parameters
+        ----------
+        symbol: str, optional
+            Symbol to remove. All symbols are removed if not passed
+        """
+        import shutil
+        if symbol is not None:
+            paths = [os.path.dirname(self.partition(symbol, "_"))]
+        else:
+            paths = [os.path.join(self.path, name) for name
+                     in os.listdir(self.path)]
+        for path in paths:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+
+    @staticmethod
+    def _write(part, filename, data):
+        # Write to a temporary file which atomically replaces the original.
+        # Must be called while holding the partition's lock
+        path = os.path.join(part, filename)
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            with open(tmp_path, "wb") as f:
+                if isinstance(data, np.ndarray):
+                    np.save(f, data)
+                else:
+                    f.write(json.dumps(data).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            replace(tmp_path, path)
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -23,10 +23,14 @@
 import json
 import logging
 import os
+import threading
 
 from pyTD.auth.tokens import AccessToken, RefreshToken
 from pyTD.cache.base import TokenCache
+from pyTD.compat import replace
+from pyTD.utils.decoders import get_decoder
 from pyTD.utils.exceptions import ConfigurationError
+from pyTD.utils.lock import FileLock
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +45,17 @@ class DiskCache(TokenCache):
         Desired directory to store cache
     filename: str
         Desired cache file name
+    decoder: str or callable, optional
+        JSON decoder of the cache file (see pyTD.utils.decoders)
+
+    The parsed cache file is kept in memory and only re-read when the file's
+    modification time, inode, or size changes (e.g. when tokens are
+    refreshed by another process).
+
+    The cache file may be shared by several processes. Updates are made
+    under an advisory lock (``<filename>.lock``) and written to a temporary
+    file which atomically replaces the cache file, and access token
+    refreshes are serialized through ``refresh_lock``.
 
     Usage
     -----
@@ -49,7 +64,7 @@ class DiskCache(TokenCache):
         >>> c.refresh_token = token
         >>> c.access_token = token
     """
-    def __init__(self, config_dir, filename):
+    def __init__(self, config_dir, filename, decoder=None):
         self.config_dir = os.path.expanduser(config_dir)
         if not os.path.isdir(self.config_dir):
             raise ConfigurationError("Directory %s not found. Configuration "
@@ -57,38 +72,91 @@ class DiskCache(TokenCache):
                                      "Try pyTD.configure()" % self.config_dir)
         self.filename = filename
         self.config_path = os.path.join(self.config_dir, self.filename)
+        self.decoder = get_decoder(decoder)
+        self._lock = threading.Lock()
+        self._file_lock = FileLock("%s.lock" % self.config_path)
+        self._refresh_lock = FileLock("%s.refresh.lock" % self.config_path)
+        self._snapshot = None
+        self._signature = None
         self._create()
 
     def clear(self):
         """
         Empties the cache, though does not delete the cache file
         """
-        with open(self.config_path, 'w') as f:
-            json_data = {
+        with self._file_lock:
+            self._write({
                 "refresh_token": None,
                 "access_token": None,
-            }
-            f.write(json.dumps(json_data))
-            f.close()
+            })
         return
 
     def _create(self):
-        if not os.path.exists(self.config_path):
-            with open(self.config_path, 'w') as f:
-                json_data = {
+        with self._file_lock:
+            if not os.path.exists(self.config_path):
+                self._write({
                     "refresh_token": None,
                     "access_token": None,
-                }
-                f.write(json.dumps(json_data))
-                f.close()
+                })
         return
 
+    def _write(self, json_data):
+        """
+        Atomically replaces the cache file. Must be called while holding the
+        file lock.
+        """
+        tmp_path = "%s.%d.tmp" % (self.config_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps(json_data))
+                f.flush()
+                os.fsync(f.fileno())
+            replace(tmp_path, self.config_path)
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise ConfigurationError("Could not update config file "
+                                     "%s" % self.config_path)
+        with self._lock:
+            self._load(self._stat_signature())
+
     def _exists(self):
         """
         Utility function to test whether the configuration exists
         """
         return os.path.isfile(self.config_path)
 
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            raise ConfigurationError("Configuration file not found in "
+                                     "%s." % self.config_path)
+        mtime = getattr(st, "st_mtime_ns", st.st_mtime)
+        return (mtime, st.st_ino, st.st_size)
+
+    def _load(self, signature):
+        with open(self.config_path, 'rb') as f:
+            config = self.decoder(f.read())
+        tokens = {}
+        if config.get("refresh_token"):
+            tokens["refresh_token"] = RefreshToken(config["refresh_token"])
+        if config.get("access_token"):
+            tokens["access_token"] = AccessToken(config["access_token"])
+        self._snapshot = (config, tokens)
+        self._signature = signature
+
+    def _read(self):
+        """
+        Returns the parsed configuration and its tokens, re-reading the
+        configuration file only if it has changed since last read
+        """
+        signature = self._stat_signature()
+        with self._lock:
+            if signature != self._signature:
+                self._load(signature)
+            return self._snapshot
+
     def _get(self, value=None):
         """
         Retrieves configuration information. If not passed a parameter,
@@ -99,24 +167,14 @@ class DiskCache(TokenCache):
         value: str, optional
             Desired configuration value to retrieve
         """
-        if self._exists() is True:
-            f = open(self.config_path, 'r')
-            config = json.load(f)
-            if value is None:
-                return config
-            elif value not in config:
-                raise ValueError("Value %s not found in configuration "
-                                 "file." % value)
-            else:
-                if value == "refresh_token" and config[value]:
-                    return RefreshToken(config[value])
-                elif value == "access_token" and config[value]:
-                    return AccessToken(config[value])
-                else:
-                    return config[value]
+        config, tokens = self._read()
+        if value is None:
+            return config
+        elif value not in config:
+            raise ValueError("Value %s not found in configuration "
+                             "file." % value)
         else:
-            raise ConfigurationError("Configuration file not found in "
-                                     "%s." % self.config_path)
+            return tokens.get(value, config[value])
 
     def _set(self, attr, payload):
         """
@@ -127,12 +185,10 @@ class DiskCache(TokenCache):
         payload: dict
             Dictionary of updated configuration variables
         """
-        with open(self.config_path) as f:
-            json_data = json.load(f)
-            f.close()
-        json_data.update({attr: payload.__dict__()})
-        with open(self.config_path, "w") as f:
-            f.write(json.dumps(json_data))
-            f.close()
-            return True
-        raise ConfigurationError("Could not update config file")
+        value = payload.__dict__() if payload is not None else None
+        with self._file_lock:
+            with open(self.config_path, 'rb') as f:
+                json_data = self.decoder(f.read())
+            json_data.update({attr: value})
+            self._write(json_data)
+        return True
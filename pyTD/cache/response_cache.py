@@ -0,0 +1,229 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from collections import OrderedDict
+
+from pyTD.compat import monotonic, replace, urlencode
+from pyTD.utils.decoders import get_decoder
+
+logger = logging.getLogger(__name__)
+
+
+def _copy(data):
+    """
+    Deep copy of a decoded JSON response (faster than copy.deepcopy)
+    """
+    if isinstance(data, dict):
+        return dict((k, _copy(v)) for k, v in data.items())
+    if isinstance(data, list):
+        return [_copy(v) for v in data]
+    return data
+
+
+class ResponseCache(object):
+    """
+    Cache of decoded API responses, keyed on request URL and parameters.
+
+    Responses are held in a bounded in-memory LRU tier and, optionally, an
+    on-disk tier which persists between sessions. Resources are only cached
+    if they define a time-to-live (``cache_ttl``) or one is given in
+    ``ttls``. Responses are copied when cached and when returned, so that
+    modifying a returned response does not affect the cache.
+
+    Parameters
+    ----------
+    maxsize: int, default 1024, optional
+        Maximum number of responses held in memory
+    cache_dir: str, optional
+        Directory of the on-disk tier. Responses are only held in memory if
+        not passed
+    ttls: dict, optional
+        Time-to-live in seconds keyed by resource class name (e.g.
+        "MarketHours"), overriding the resource defaults. A value of None
+        or 0 disables caching of that resource
+    decoder: str or callable, optional
+        JSON decoder of the on-disk tier (see pyTD.utils.decoders)
+
+    Usage
+    -----
+
+        >>> c = ResponseCache(maxsize=512, ttls={"Instruments": 3600})
+        >>> a = api(consumer_key=..., callback_url=..., response_cache=c)
+        >>> c.stats
+        {'hits': 0, 'misses': 0, 'size': 0}
+    """
+    def __init__(self, maxsize=1024, cache_dir=None, ttls=None,
+                 decoder=None):
+        self.maxsize = maxsize
+        self.decoder = get_decoder(decoder)
+        self.cache_dir = cache_dir
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if self.cache_dir is not None:
+            self.cache_dir = os.path.expanduser(self.cache_dir)
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        fmt = "ResponseCache(maxsize= %s, cache_dir = %s, size = %s)"
+        return fmt % (self.maxsize, self.cache_dir, len(self))
+
+    @property
+    def stats(self):
+        """Hit and miss counters and the number of responses in memory"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def ttl(self, resource):
+        """
+        Time-to-live of a resource's responses
+
+        Parameters
+        ----------
+        resource: pyTD.resource.Get
+            The requesting resource
+        """
+        name = type(resource).__name__
+        if name in self.ttls:
+            return self.ttls[name]
+        return resource.cache_ttl
+
+    @staticmethod
+    def key(url, params=None):
+        """
+        Canonical cache key of a request
+
+        Parameters
+        ----------
+        url: str
+            Request URL
+        params: dict, optional
+            Request parameters
+        """
+        params = sorted((k, str(v)) for k, v in (params or {}).items()
+                        if k != "apikey")
+        return "%s?%s" % (url, urlencode(params))
+
+    def get(self, key):
+        """
+        Retrieves a cached response, or None if not cached or expired
+
+        Parameters
+        ----------
+        key: str
+            Cache key
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > monotonic():
+                    self._data[key] = self._data.pop(key)
+                    self.hits += 1
+                    return _copy(entry[1])
+                del self._data[key]
+        data, ttl = self._disk_get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, _copy(data), ttl)
+        return data
+
+    def set(self, key, data, ttl):
+        """
+        Caches a response
+
+        Parameters
+        ----------
+        key: str
+            Cache key
+        data: dict or list
+            Decoded response
+        ttl: float
+            Time-to-live in seconds
+        """
+        with self._lock:
+            self._store(key, _copy(data), ttl)
+        self._disk_set(key, data, ttl)
+
+    def clear(self):
+        """
+        Empties the cache, including the on-disk tier
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+        if self.cache_dir is not None:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _store(self, key, data, ttl):
+        self._data.pop(key, None)
+        self._data[key] = (monotonic() + ttl, data)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _path(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "%s.json" % name)
+
+    def _disk_get(self, key):
+        if self.cache_dir is None:
+            return None, None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = self.decoder(f.read())
+        except (IOError, OSError, ValueError):
+            return None, None
+        ttl = entry["expires"] - time.time()
+        if entry["key"] != key or ttl <= 0:
+            return None, None
+        return entry["data"], ttl
+
+    def _disk_set(self, key, data, ttl):
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        tmp = "%s.%s.tmp" % (path, os.getpid())
+        entry = {"key": key, "expires": time.time() + ttl, "data": data}
+        try:
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            replace(tmp, path)
+        except (IOError, OSError) as e:
+            logger.warning("Could not write response cache file %s: "
+                           "%s" % (path, e))
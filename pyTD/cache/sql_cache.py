@@ -0,0 +1,183 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+
+from pyTD.auth.tokens import AccessToken, RefreshToken
+from pyTD.cache.base import TokenCache
+from pyTD.utils.exceptions import ConfigurationError
+from pyTD.utils.lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+
+class SQLCache(TokenCache):
+    """
+    SQLite token cache for access and refresh tokens. A single database
+    (in WAL mode, allowing concurrent readers) holds the tokens of any
+    number of consumer keys, each of which is accessed through its own
+    SQLCache.
+
+    Attributes
+    ----------
+    path: str
+        Path of the database file
+    consumer_key: str
+        Consumer key whose tokens are accessed
+    timeout: float, default 30, optional
+        Seconds to wait for a database lock held by another connection
+
+    Usage
+    -----
+
+        >>> c = SQLCache("~/.tdm/tokens.db", "TEST@AMER.OAUTHAP")
+        >>> c.refresh_token = token
+        >>> c.access_token = token
+    """
+    _TOKENS = {"refresh_token": RefreshToken,
+               "access_token": AccessToken}
+
+    def __init__(self, path, consumer_key, timeout=30):
+        self.path = os.path.expanduser(path)
+        config_dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(config_dir):
+            raise ConfigurationError("Directory %s not found. Configuration "
+                                     "likely incomplete. "
+                                     "Try pyTD.configure()" % config_dir)
+        self.consumer_key = consumer_key
+        self.timeout = timeout
+        self._local = threading.local()
+        key_hash = hashlib.sha1(consumer_key.encode("utf-8")).hexdigest()
+        self._refresh_lock = FileLock("%s.%s.refresh.lock" %
+                                      (self.path, key_hash[:16]))
+        self._create()
+
+    def __repr__(self):
+        return "SQLCache(path= %s, consumer_key = %s)" % (
+            self.path, self.consumer_key)
+
+    @property
+    def _conn(self):
+        # sqlite3 connections may not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def clear(self):
+        """
+        Removes the tokens of this consumer key
+        """
+        with self._conn as conn:
+            conn.execute("DELETE FROM tokens WHERE consumer_key = ?",
+                         (self.consumer_key,))
+
+    def consumer_keys(self):
+        """
+        Returns the consumer keys of all tokens stored in the database
+        """
+        rows = self._conn.execute("SELECT DISTINCT consumer_key FROM tokens "
+                                  "ORDER BY consumer_key")
+        return [row[0] for row in rows]
+
+    def update(self, refresh_token=None, access_token=None):
+        """
+        Stores a refresh token and/or an access token in a single
+        transaction
+
+        Parameters
+        ----------
+        refresh_token: RefreshToken, optional
+            New refresh token
+        access_token: AccessToken, optional
+            New access token
+        """
+        tokens = [("refresh_token", refresh_token),
+                  ("access_token", access_token)]
+        with self._conn as conn:
+            for name, token in tokens:
+                if token is not None:
+                    self._write(conn, name, token)
+
+    def _create(self):
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS tokens ("
+                         "consumer_key TEXT NOT NULL, "
+                         "name TEXT NOT NULL, "
+                         "token TEXT NOT NULL, "
+                         "access_time INTEGER NOT NULL, "
+                         "expires_in INTEGER NOT NULL, "
+                         "PRIMARY KEY (consumer_key, name))")
+
+    def _exists(self):
+        return os.path.isfile(self.path)
+
+    def _get(self, value=None):
+        """
+        Retrieves a token of this consumer key. If not passed a parameter,
+        returns all tokens as a dictionary
+
+        Parameters
+        ----------
+        value: str, optional
+            Desired token ("refresh_token" or "access_token")
+        """
+        if value is None:
+            rows = self._conn.execute("SELECT name, token, access_time, "
+                                      "expires_in FROM tokens WHERE "
+                                      "consumer_key = ?",
+                                      (self.consumer_key,))
+            return {row[0]: self._token(*row) for row in rows}
+        if value not in self._TOKENS:
+            raise ValueError("Value %s not found in token cache." % value)
+        row = self._conn.execute("SELECT token, access_time, expires_in "
+                                 "FROM tokens WHERE consumer_key = ? AND "
+                                 "name = ?",
+                                 (self.consumer_key, value)).fetchone()
+        return self._token(value, *row) if row else None
+
+    def _token(self, name, token, access_time, expires_in):
+        return self._TOKENS[name](token=token, access_time=access_time,
+                                  expires_in=expires_in)
+
+    def _set(self, attr, payload):
+        with self._conn as conn:
+            if payload is None:
+                conn.execute("DELETE FROM tokens WHERE consumer_key = ? AND "
+                             "name = ?", (self.consumer_key, attr))
+            else:
+                self._write(conn, attr, payload)
+        return True
+
+    def _write(self, conn, name, token):
+        conn.execute("INSERT OR REPLACE INTO tokens (consumer_key, name, "
+                     "token, access_time, expires_in) VALUES "
+                     "(?, ?, ?, ?, ?)", (self.consumer_key, name, token.token,
+                                         token.access_time, token.expires_in))
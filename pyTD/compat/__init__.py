@@ -21,6 +21,7 @@
 # SOFTWARE.
 
 import sys
+import time
 from distutils.version import LooseVersion
 
 import pandas as pd
@@ -43,12 +44,18 @@ else:
     from pandas.core.common import is_list_like  # noqa
 
 if PY3:
+    string_types = str,
+    monotonic = time.monotonic
+    from os import replace
     from urllib.error import HTTPError
     from urllib.parse import urlparse, urlencode, parse_qs
     from io import StringIO
     from http.server import HTTPServer, BaseHTTPRequestHandler
     from mock import MagicMock
 else:
+    string_types = basestring,  # noqa
+    monotonic = time.time
+    from os import rename as replace  # noqa
     from urllib2 import HTTPError  # noqa
     from urlparse import urlparse, parse_qs  # noqa
     from urllib import urlencode  # noqa
@@ -32,7 +32,7 @@ def get_instrument(*args, **kwargs):
     symbol: str
         A CUSIP ID or symbol
     output_format: str, default "pandas", optional
-        Desired output format. "pandas" or "json"
+        Desired output format. "pandas", "json", "arrow", or "raw"
     """
     return Instruments(*args, **kwargs).execute()
 
@@ -49,6 +49,6 @@ def get_instruments(*args, **kwargs):
     projection: str, default symbol-search, optional
         Type of request (see documentation)
     output_format: str, default "pandas", optional
-        Desired output format. "pandas" or "json"
+        Desired output format. "pandas", "json", "arrow", or "raw"
     """
     return Instruments(*args, **kwargs).execute()
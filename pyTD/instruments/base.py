@@ -22,13 +22,60 @@
 
 from pyTD.auth import auth_check
 from pyTD.resource import Get
+from pyTD.utils.arrow import table_from_rows
 from pyTD.utils.exceptions import ResourceNotFound
 
 
 class Instruments(Get):
     """
     Class for retrieving instruments
+
+    Parameters
+    ----------
+    symbol: str
+        A CUSIP ID, symbol, regular expression, or snippet (depends on the
+        value of projection)
+    projection: str, default "symbol-search", optional
+        Type of request (symbol-search, symbol-regex, desc-search,
+        desc-regex, or fundamental)
+    output_format: str, default "pandas", optional
+        Desired output format. "pandas", "json", "arrow" (a pyarrow.Table,
+        requires pyarrow), or "raw" (the undecoded response as
+        pyTD.resource.RawResponse)
+    api: pyTD.api.api object, optional
+        A pyTD api object. If not passed, API requestor defaults to
+        pyTD.api.default_api
     """
+    # Schemas of the arrow output format, with one row per instrument
+    _ARROW_FIELDS = (("symbol", "string"), ("cusip", "string"),
+                     ("description", "string"), ("exchange", "string"),
+                     ("assetType", "string"))
+    _FUNDAMENTAL_ARROW_FIELDS = (
+        ("symbol", "string"), ("high52", "float64"), ("low52", "float64"),
+        ("dividendAmount", "float64"), ("dividendYield", "float64"),
+        ("dividendDate", "string"), ("peRatio", "float64"),
+        ("pegRatio", "float64"), ("pbRatio", "float64"),
+        ("prRatio", "float64"), ("pcfRatio", "float64"),
+        ("grossMarginTTM", "float64"), ("grossMarginMRQ", "float64"),
+        ("netProfitMarginTTM", "float64"), ("netProfitMarginMRQ", "float64"),
+        ("operatingMarginTTM", "float64"), ("operatingMarginMRQ", "float64"),
+        ("returnOnEquity", "float64"), ("returnOnAssets", "float64"),
+        ("returnOnInvestment", "float64"), ("quickRatio", "float64"),
+        ("currentRatio", "float64"), ("interestCoverage", "float64"),
+        ("totalDebtToCapital", "float64"), ("ltDebtToEquity", "float64"),
+        ("totalDebtToEquity", "float64"), ("epsTTM", "float64"),
+        ("epsChangePercentTTM", "float64"), ("epsChangeYear", "float64"),
+        ("epsChange", "float64"), ("revChangeYear", "float64"),
+        ("revChangeTTM", "float64"), ("revChangeIn", "float64"),
+        ("sharesOutstanding", "float64"), ("marketCapFloat", "float64"),
+        ("marketCap", "float64"), ("bookValuePerShare", "float64"),
+        ("shortIntToFloat", "float64"), ("shortIntDayToCover", "float64"),
+        ("divGrowthRate3Year", "float64"), ("dividendPayAmount", "float64"),
+        ("dividendPayDate", "string"), ("beta", "float64"),
+        ("vol1DayAvg", "float64"), ("vol10DayAvg", "float64"),
+        ("vol3MonthAvg", "float64")
+    )
+
     def __init__(self, symbol, **kwargs):
         self.symbol = symbol
         self.output_format = kwargs.get("output_format", "pandas")
@@ -46,6 +93,12 @@ class Instruments(Get):
             "projection": self.projection
         }
 
+    @property
+    def cache_ttl(self):
+        if self.projection == "fundamental":
+            return 3600
+        return 24 * 3600
+
     def _convert_output(self, out):
         import pandas as pd
         if self.projection == "fundamental":
@@ -53,13 +106,29 @@ class Instruments(Get):
                                  out[self.symbol]["fundamental"]})
         return pd.DataFrame(out)
 
+    def _convert_arrow(self, out):
+        if self.projection == "fundamental":
+            rows = [dict(data["fundamental"], symbol=sym)
+                    for sym, data in out.items()]
+            return table_from_rows(rows, self._FUNDAMENTAL_ARROW_FIELDS)
+        return table_from_rows(list(out.values()), self._ARROW_FIELDS)
+
     @auth_check
     def execute(self):
         data = self.get()
         if not data:
             raise ResourceNotFound("Instrument data for %s not"
                                    " found." % self.symbol)
-        if self.output_format == "pandas":
-            return self._convert_output(data)
+        return self._output_format(data)
+
+    def _output_format(self, out):
+        if self.output_format == "json":
+            return out
+        elif self.output_format == "pandas":
+            return self._convert_output(out)
+        elif self.output_format == "arrow":
+            return self._convert_arrow(out)
+        elif self.output_format == "raw":
+            return out
         else:
-            return data
+            raise ValueError("Please enter a valid output format.")
@@ -26,6 +26,7 @@ from pyTD.market.quotes import Quotes
 from pyTD.market.movers import Movers
 from pyTD.market.options import Options
 from pyTD.market.price_history import PriceHistory
+from pyTD.market.resample import resample
 
 
 def get_fundamentals(*args, **kwargs):
@@ -38,7 +39,7 @@ def get_fundamentals(*args, **kwargs):
         A CUSIP ID, symbol, regular expression, or snippet (depends on the
         value of the "projection" variable)
     output_format: str, default "pandas", optional
-        Desired output format. "pandas" or "json"
+        Desired output format. "pandas", "json", "arrow", or "raw"
     """
     kwargs.update({"projection": "fundamental"})
     return Instruments(*args, **kwargs).execute()
@@ -52,9 +53,17 @@ def get_quotes(*args, **kwargs):
     ----------
     symbols : str, array-like object (list, tuple, Series), or DataFrame
         Single stock symbol (ticker), array-like object of symbols or
-        DataFrame with index containing up to 100 stock symbols.
+        DataFrame with index containing stock symbols. Symbols are requested
+        in batches of up to 100.
     output_format: str, default 'pandas', optional
-        Desired output format (json or DataFrame)
+        Desired output format (json, DataFrame, arrow, numpy, or raw)
+    batch_size: int, default 100, optional
+        Number of symbols per request (at most 100)
+    max_workers: int, default 1, optional
+        Number of batches to retrieve concurrently
+    fields: list-like, optional
+        Quote fields to keep (e.g. ["lastPrice", "totalVolume"]), along with
+        the symbol. All fields are kept by default
     kwargs: additional request parameters (see _TDBase class)
     """
     return Quotes(*args, **kwargs).execute()
@@ -73,7 +82,7 @@ def get_market_hours(*args, **kwargs):
         Operating date, timestamp. Parses many different kind of date
         representations (e.g., 'JAN-01-2015', '1/1/15', 'Jan, 1, 1980')
     output_format: str, default 'pandas', optional
-        Desired output format (json or DataFrame)
+        Desired output format (json, DataFrame, arrow, or raw)
     kwargs: additional request parameters (see _TDBase class)
     """
     return MarketHours(*args, **kwargs).execute()
@@ -92,7 +101,7 @@ def get_movers(*args, **kwargs):
     change: str, default percent, optional
         Return movers by percent change or value change
     output_format: str, default 'pandas', optional
-        Desired output format (json or DataFrame)
+        Desired output format (json, DataFrame, arrow, or raw)
     kwargs: additional request parameters (see _TDBase class)
     """
     return Movers(*args, **kwargs).execute()
@@ -141,6 +150,9 @@ def get_option_chains(*args, **kwargs):
     optionType: str, optional
         Type of contracts to return (S: standard, NS: nonstandard,
         ALL: all contracts)
+    stream: bool, default False, optional
+        Parse the chain incrementally into a table with one row per contract
+        (requires ijson)
     output_format: str, optional, default 'pandas'
         Desired output format
     api: pyTD.api.api object, optional
@@ -176,52 +188,54 @@ def get_price_history(*args, **kwargs):
     extended: str or bool, default 'True'/True, optional
         True to return extended hours data, False for regular hours only
     output_format: str, default 'pandas', optional
-        Desired output format (json or DataFrame)
+        Desired output format (json, DataFrame, arrow, or raw)
+    max_workers: int, default 1, optional
+        Number of symbols to retrieve concurrently
+    candle_store: pyTD.cache.CandleStore, optional
+        Local store of candles. Only the parts of the date range which are
+        not stored are requested
     """
     return PriceHistory(*args, **kwargs).execute()
 
 
-# def get_history_intraday(symbols, start, end, interval='1m', extended=True,
-#                          output_format='pandas'):
-#     """
-#     Function to retrieve intraday price history for a given symbol
-
-#     Parameters
-#     ----------
-#     symbols : string, array-like object (list, tuple, Series), or DataFrame
-#         Desired symbols for retrieval
-#     startDate : string or DateTime object, optional
-#         Starting date, timestamp. Parses many different kind of date
-#         representations (e.g., 'JAN-01-2015', '1/1/15', 'Jan, 1, 1980')
-#     endDate : string or DateTime object, optional
-#         Ending date, timestamp. Parses many different kind of date
-#         representations (e.g., 'JAN-01-2015', '1/1/15', 'Jan, 1, 1980')
-#     interval: string, default '1m', optional
-#         Desired interval (1m, 5m, 15m, 30m, 60m)
-#     needExtendedHoursData: str or bool, default 'True'/True, optional
-#         True to return extended hours data, False for regular hours only
-#     output_format: str, default 'pandas', optional
-#         Desired output format (json or DataFrame)
-#     """
-#     result = PriceHistory(symbols, start_date=start, end_date=end,
-#                           extended=extended,
-#                           output_format=output_format).execute()
-#     if interval == '1m':
-#         return result
-#     elif interval == '5m':
-#         sample = result.index.floor('5T').drop_duplicates()
-#         return result.reindex(sample, method='ffill')
-#     elif interval == '15m':
-#         sample = result.index.floor('15T').drop_duplicates()
-#         return result.reindex(sample, method='ffill')
-#     elif interval == '30m':
-#         sample = result.index.floor('30T').drop_duplicates()
-#         return result.reindex(sample, method='ffill')
-#     elif interval == '60m':
-#         sample = result.index.floor('60T').drop_duplicates()
-#         return result.reindex(sample, method='ffill')
-#     else:
-#         raise ValueError("Interval must be 1m, 5m, 15m, 30m, or 60m.")
+def get_history_intraday(symbols, start, end, interval='1m', extended=True,
+                         tz="America/New_York", **kwargs):
+    """
+    Function to retrieve intraday price history for a given symbol. Minute
+    candles are retrieved once and aggregated into bars of each interval
+    (see pyTD.market.resample)
+
+    Parameters
+    ----------
+    symbols : string, array-like object (list, tuple, Series), or DataFrame
+        Desired symbols for retrieval
+    start : string or DateTime object
+        Starting date, timestamp. Parses many different kind of date
+        representations (e.g., 'JAN-01-2015', '1/1/15', 'Jan, 1, 1980')
+    end : string or DateTime object
+        Ending date, timestamp. Parses many different kind of date
+        representations (e.g., 'JAN-01-2015', '1/1/15', 'Jan, 1, 1980')
+    interval: str or list-like, default '1m', optional
+        Desired interval (e.g. 1m, 5m, 15m, 30m, 1h, 1d), or a list of
+        intervals
+    extended: str or bool, default 'True'/True, optional
+        True to return extended hours data, False for regular hours only
+    tz: str, default "America/New_York", optional
+        Time zone to align bars to. Daily bars span a trading session
+    kwargs: additional PriceHistory parameters (e.g. api, max_workers,
+        candle_store)
+
+    Returns
+    -------
+    bars: pandas.DataFrame or dict
+        Bars, or a dict of bars keyed by interval if a list of intervals was
+        passed
+    """
+    kwargs.update(output_format="pandas")
+    result = PriceHistory(symbols, start_date=start, end_date=end,
+                          period_type="day", frequency_type="minute",
+                          frequency=1, extended=extended, **kwargs).execute()
+    return resample(result, interval, tz=tz)
 
 
 # def get_history_daily(symbols, start, end, output_format='pandas'):
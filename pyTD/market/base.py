@@ -43,7 +43,10 @@ class MarketData(Get):
     symbols: str or list-like, optional
         A symbol or list of symbols
     output_format: str, optional, default 'json'
-        Desired output format (json or Pandas DataFrame)
+        Desired output format (json, Pandas DataFrame, arrow, numpy, or
+        raw). The arrow format returns a pyarrow.Table (requires pyarrow),
+        the numpy format a structured array (Quotes only) and the raw format
+        the undecoded responses as pyTD.resource.RawResponse
     api: pyTD.api.api object, optional
         A pyTD api object. If not passed, API requestor defaults to
         pyTD.api.default_api
@@ -68,6 +71,14 @@ class MarketData(Get):
         import pandas as pd
         return pd.DataFrame(out)
 
+    def _convert_arrow(self, out):
+        raise ValueError("The arrow output format is not supported by "
+                         "%s." % type(self).__name__)
+
+    def _convert_numpy(self, out):
+        raise ValueError("The numpy output format is not supported by "
+                         "%s." % type(self).__name__)
+
     @auth_check
     def execute(self):
         out = self.get()
@@ -78,5 +89,11 @@ class MarketData(Get):
             return out
         elif self.output_format == 'pandas':
             return self._convert_output(out)
+        elif self.output_format == 'arrow':
+            return self._convert_arrow(out)
+        elif self.output_format == 'numpy':
+            return self._convert_numpy(out)
+        elif self.output_format == 'raw':
+            return out
         else:
             raise ValueError("Please enter a valid output format.")
@@ -25,6 +25,7 @@ import pandas as pd
 
 from pyTD.market.base import MarketData
 from pyTD.utils import _handle_lists
+from pyTD.utils.arrow import table_from_rows
 
 
 class MarketHours(MarketData):
@@ -39,7 +40,7 @@ class MarketHours(MarketData):
     date : datetime.datetime object, optional
         Data to retrieve hours for (defaults to current day)
     output_format: str, optional, default 'pandas'
-        Desired output format (json or Pandas DataFrame).
+        Desired output format (json, Pandas DataFrame, arrow, or raw).
 
         .. note:: JSON output formatting only if "FUTURE" is selected.
     api: pyTD.api.api object, optional
@@ -52,6 +53,19 @@ class MarketHours(MarketData):
                 "bond": "BON",
                 "forex": "forex"}
 
+    # Schema of the arrow output format, with one row per market product.
+    # Session times are ISO 8601 strings with UTC offsets
+    _ARROW_FIELDS = (("market", "string"), ("product", "string"),
+                     ("productName", "string"), ("date", "string"),
+                     ("marketType", "string"), ("exchange", "string"),
+                     ("category", "string"), ("isOpen", "bool"),
+                     ("preMarketStart", "string"),
+                     ("preMarketEnd", "string"),
+                     ("regularMarketStart", "string"),
+                     ("regularMarketEnd", "string"),
+                     ("postMarketStart", "string"),
+                     ("postMarketEnd", "string"))
+
     def __init__(self, markets="EQUITY", date=None, output_format='pandas',
                  api=None):
         self.date = date or datetime.datetime.now()
@@ -74,7 +88,25 @@ class MarketHours(MarketData):
     def resource(self):
         return 'hours'
 
+    @property
+    def cache_ttl(self):
+        # Operating hours of a given date are rarely amended
+        return 6 * 3600
+
     def _convert_output(self, out):
         data = {market: out[market][self._MARKETS[market]] for market in
                 self.markets}
         return pd.DataFrame(data)
+
+    def _convert_arrow(self, out):
+        rows = []
+        for market, products in out.items():
+            for product, hours in products.items():
+                row = dict(hours, market=market, product=product)
+                sessions = hours.get("sessionHours") or {}
+                for session, periods in sessions.items():
+                    if periods:
+                        row["%sStart" % session] = periods[0]["start"]
+                        row["%sEnd" % session] = periods[-1]["end"]
+                rows.append(row)
+        return table_from_rows(rows, self._ARROW_FIELDS)
@@ -22,6 +22,7 @@
 
 from pyTD.market.base import MarketData
 from pyTD.utils import _handle_lists
+from pyTD.utils.arrow import table_from_rows
 
 
 class Movers(MarketData):
@@ -37,13 +38,17 @@ class Movers(MarketData):
     change: str, default 'percent', optional
         To return movers with the specified change types of percent or value
     output_format: str, optional, default 'json'
-        Desired output format (json or Pandas DataFrame)
+        Desired output format (json, Pandas DataFrame, arrow, or raw)
     api: pyTD.api.api object, optional
         A pyTD api object. If not passed, API requestor defaults to
         pyTD.api.default_api
 
     WARNING: this endpoint is often not functional outside of trading hours.
     """
+    # Schema of the arrow output format
+    _ARROW_FIELDS = (("symbol", "string"), ("description", "string"),
+                     ("direction", "string"), ("change", "float64"),
+                     ("last", "float64"), ("totalVolume", "int64"))
 
     def __init__(self, symbols, direction='up', change='percent',
                  output_format='pandas', api=None):
@@ -57,6 +62,9 @@ class Movers(MarketData):
         import pandas as pd
         return pd.DataFrame(out).set_index("symbol")
 
+    def _convert_arrow(self, out):
+        return table_from_rows(out, self._ARROW_FIELDS)
+
     @property
     def params(self):
         return {
@@ -20,9 +20,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from collections import OrderedDict
+
 from pyTD.market.base import MarketData
 from pyTD.utils import _handle_lists
-from pyTD.utils.exceptions import ResourceNotFound
+from pyTD.utils.arrow import table_from_columns, table_from_rows
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
 
 
 class Options(MarketData):
@@ -69,12 +72,47 @@ class Options(MarketData):
         3-character format (JAN, FEB, MAR, etc.)
     option_type: str, default "ALL", optional
         Type of contracts to return (S, NS, ALL)
+    stream: bool, default False, optional
+        Parse the chain incrementally as it is received, into a table with
+        one row per contract (with its expiration date key ``expDate`` and
+        ``strike``). Peak memory is then proportional to the table rather
+        than the JSON document, which matters for large chains (e.g. SPX).
+        Nested contract fields (e.g. optionDeliverablesList) are omitted,
+        and the json output format returns the columns of the table.
+        Ignored by the raw output format. Requires ijson
     output_format: str, optional, default 'json'
-        Desired output format
+        Desired output format (json, Pandas DataFrame, arrow, or raw)
     api: pyTD.api.api object, optional
         A pyTD api object. If not passed, API requestor defaults to
         pyTD.api.default_api
     """
+    _EXP_DATE_MAPS = {"callExpDateMap": "CALL", "putExpDateMap": "PUT"}
+
+    # Schema of the arrow output format, with one row per contract
+    _ARROW_FIELDS = (
+        ("expDate", "string"), ("strike", "float64"), ("putCall", "string"),
+        ("symbol", "string"), ("description", "string"),
+        ("exchangeName", "string"), ("bid", "float64"), ("ask", "float64"),
+        ("last", "float64"), ("mark", "float64"), ("bidSize", "int64"),
+        ("askSize", "int64"), ("bidAskSize", "string"),
+        ("lastSize", "int64"), ("highPrice", "float64"),
+        ("lowPrice", "float64"), ("openPrice", "float64"),
+        ("closePrice", "float64"), ("totalVolume", "int64"),
+        ("tradeTimeInLong", "timestamp[ms]"),
+        ("quoteTimeInLong", "timestamp[ms]"), ("netChange", "float64"),
+        ("volatility", "float64"), ("delta", "float64"),
+        ("gamma", "float64"), ("theta", "float64"), ("vega", "float64"),
+        ("rho", "float64"), ("openInterest", "int64"),
+        ("timeValue", "float64"), ("theoreticalOptionValue", "float64"),
+        ("theoreticalVolatility", "float64"), ("strikePrice", "float64"),
+        ("expirationDate", "timestamp[ms]"), ("daysToExpiration", "int64"),
+        ("expirationType", "string"), ("lastTradingDay", "timestamp[ms]"),
+        ("multiplier", "float64"), ("settlementType", "string"),
+        ("deliverableNote", "string"), ("isIndexOption", "bool"),
+        ("percentChange", "float64"), ("markChange", "float64"),
+        ("markPercentChange", "float64"), ("inTheMoney", "bool"),
+        ("mini", "bool"), ("nonStandard", "bool")
+    )
 
     def __init__(self, symbol, **kwargs):
         self.contract_type = kwargs.pop("contract_type", "ALL")
@@ -92,6 +130,7 @@ class Options(MarketData):
         self.days_to_expiration = kwargs.pop("days_to_expiration", "")
         self.exp_month = kwargs.pop("exp_month", "")
         self.option_type = kwargs.pop("option_type", "")
+        self.stream = kwargs.pop("stream", False)
         self.output_format = kwargs.pop("output_format", 'pandas')
         self.api = kwargs.pop("api", None)
         self.opts = kwargs
@@ -127,6 +166,8 @@ class Options(MarketData):
 
     def _convert_output(self, out):
         import pandas as pd
+        if self.stream:
+            return pd.DataFrame(out, columns=list(out))
         ret = {}
         ret2 = {}
         if self.contract_type in ["CALL", "ALL"]:
@@ -140,9 +181,106 @@ class Options(MarketData):
         return pd.concat([pd.DataFrame(ret).T, pd.DataFrame(ret2).T], axis=1,
                          keys=["calls", "puts"])
 
+    def _convert_arrow(self, out):
+        if self.stream:
+            length = len(next(iter(out.values()))) if out else 0
+            return table_from_columns(out, self._ARROW_FIELDS, length)
+        rows = []
+        for exp_date_map in sorted(self._EXP_DATE_MAPS):
+            for exp_date, strikes in out.get(exp_date_map, {}).items():
+                for strike, contracts in strikes.items():
+                    for contract in contracts:
+                        row = dict(contract, expDate=exp_date,
+                                   strike=float(strike))
+                        rows.append(row)
+        return table_from_rows(rows, self._ARROW_FIELDS)
+
     def get(self):
-        data = super(Options, self).get()
-        if data["status"] == "FAILED":
+        if self.stream and self.output_format != 'raw':
+            response = self.api.request("GET", url=self.url,
+                                        params=self.params, stream=True)
+            try:
+                # Decompress the body if it was sent compressed
+                response.raw.decode_content = True
+                return self._parse_chain(response.raw)
+            finally:
+                response.close()
+        return self._check_status(super(Options, self).get())
+
+    def _check_status(self, data):
+        if self.output_format == 'raw':
+            failed = (data.contains(b'"FAILED"') and
+                      data.json().get("status") == "FAILED")
+        else:
+            failed = data["status"] == "FAILED"
+        if failed:
             raise ResourceNotFound(message="Option chains for %s not "
                                    "found." % self.symbols)
         return data
+
+    def _parse_chain(self, f):
+        """
+        Incrementally parses an option chain from a file-like object into
+        columns of contract fields, appending each contract as it is parsed
+
+        Returns
+        -------
+        columns: OrderedDict
+            Lists of field values keyed by field name
+        """
+        try:
+            import ijson
+        except ImportError:
+            raise ImportError("Streaming option chains requires ijson.")
+        columns = OrderedDict()
+        rows = 0
+        status = error = None
+        # Keys of the open containers. Strike keys contain dots, so event
+        # prefixes cannot be used to locate contracts
+        keys = []
+        key = row = None
+        try:
+            for event, value in ijson.basic_parse(f, use_float=True):
+                if event == "map_key":
+                    key = value
+                    if len(keys) == 1 and key == "error":
+                        error = True
+                elif event == "start_map" or event == "start_array":
+                    keys.append(key)
+                    # root, exp date map, exp date, strike, contract list
+                    if (event == "start_map" and len(keys) == 5 and
+                            keys[1] in self._EXP_DATE_MAPS):
+                        row = OrderedDict([("expDate", keys[2]),
+                                           ("strike", float(keys[3]))])
+                elif event == "end_map" or event == "end_array":
+                    if row is not None and len(keys) == 5:
+                        self._append_row(columns, row, rows)
+                        rows += 1
+                        row = None
+                    keys.pop()
+                elif row is not None and len(keys) == 5:
+                    row[key] = value
+                elif len(keys) == 1 and key == "status":
+                    status = value
+                elif len(keys) == 1 and key == "error":
+                    error = value
+        except ijson.JSONError:
+            raise TDQueryError(message="An error occurred during the query.")
+        if error is not None:
+            raise TDQueryError(message="An error occurred during the query.",
+                               content=error)
+        if status == "FAILED":
+            raise ResourceNotFound(message="Option chains for %s not "
+                                   "found." % self.symbols)
+        return columns
+
+    @staticmethod
+    def _append_row(columns, row, rows):
+        for field, value in row.items():
+            if field not in columns:
+                columns[field] = [None] * rows
+            columns[field].append(value)
+        # Fields missing from this contract
+        for column in columns.values():
+            if len(column) == rows:
+                column.append(None)
@@ -21,12 +21,97 @@
 # SOFTWARE.
 
 import datetime
+import logging
+import numpy as np
 import pandas as pd
 
+from collections import OrderedDict
+
 from pyTD.auth import auth_check
+from pyTD.cache.candle_store import _candles_to_records
 from pyTD.market.base import MarketData
-from pyTD.utils import _sanitize_dates, to_timestamp, _handle_lists
-from pyTD.utils.exceptions import ResourceNotFound
+from pyTD.utils import (_sanitize_dates, to_timestamp, _handle_lists,
+                        _map_concurrent)
+from pyTD.utils.arrow import concat_tables, table_from_columns
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
+
+logger = logging.getLogger(__name__)
+
+_DAY = 24 * 3600 * 1000
+
+_CANDLE_FIELDS = (("open", np.float64), ("high", np.float64),
+                  ("low", np.float64), ("close", np.float64),
+                  ("volume", np.int64))
+
+
+def _candles_to_arrays(candles):
+    """
+    Decodes candles into preallocated arrays
+
+    Parameters
+    ----------
+    candles: list or numpy.ndarray
+        Candles as returned by the Get Price History endpoint, or a
+        structured array of pyTD.cache.candle_store.CANDLE_DTYPE
+
+    Returns
+    -------
+    (index, columns): tuple
+        int64 nanosecond timestamps, and float64 OHLC and int64 volume
+        arrays keyed by field
+
+    Raises
+    ------
+    KeyError
+        If a candle is missing a field
+    """
+    if isinstance(candles, np.ndarray):
+        # Candles of a pyTD.cache.CandleStore
+        index = candles["datetime"] * 10 ** 6
+        columns = OrderedDict((field, np.ascontiguousarray(candles[field]))
+                              for field, _ in _CANDLE_FIELDS)
+        return index, columns
+    count = len(candles)
+    index = np.fromiter((c["datetime"] for c in candles), dtype=np.int64,
+                        count=count)
+    # Integer milliseconds to nanoseconds, without a float round trip
+    index *= 10 ** 6
+    columns = OrderedDict()
+    for field, dtype in _CANDLE_FIELDS:
+        columns[field] = np.fromiter((c[field] for c in candles), dtype=dtype,
+                                     count=count)
+    return index, columns
+
+
+def _arrays_to_frame(index, columns):
+    """
+    Builds a candle DataFrame from the output of _candles_to_arrays without
+    copying the arrays
+    """
+    index = pd.DatetimeIndex(index.view("datetime64[ns]"), name="datetime")
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def _stitch_candles(chunks):
+    """
+    Joins the candles of consecutive ranges into a structured array of
+    pyTD.cache.candle_store.CANDLE_DTYPE, sorted by time and without
+    duplicates. Candles without the usual fields are joined as a list
+    """
+    try:
+        records = _candles_to_records([c for chunk in chunks for c in chunk])
+    except (KeyError, TypeError, ValueError):
+        unique = dict((c["datetime"], c) for chunk in chunks for c in chunk)
+        return [unique[t] for t in sorted(unique)]
+    _, keep = np.unique(records["datetime"], return_index=True)
+    return records[keep]
+
+
+def _records_to_candles(records):
+    """
+    Converts a structured array of candles to the endpoint's format
+    """
+    return [dict(zip(records.dtype.names, c)) for c in records.tolist()]
 
 
 class PriceHistory(MarketData):
@@ -34,6 +119,11 @@ class PriceHistory(MarketData):
     Class for retrieving data from the Get Price History endpoint. Defaults to
     a 10-day, 1-minute chart
 
+    Date ranges passed as start_date or end_date which are longer than the
+    endpoint serves in a single request (e.g. 10 days of minute candles) are
+    split into several requests, whose candles are joined, sorted and
+    deduplicated.
+
     Parameters
     ----------
     symbols : string, array-like object (list, tuple, Series), or DataFrame
@@ -58,21 +148,56 @@ class PriceHistory(MarketData):
     extended: bool, default True, optional
         True to return extended hours data, False for regular market hours only
     output_format: str, optional, default 'pandas'
-        Desired output format (json or Pandas DataFrame)
+        Desired output format (json, Pandas DataFrame, arrow, or raw)
+    max_workers: int, default 1, optional
+        Number of requests to make concurrently. Requests are made one at a
+        time if 1
     api: pyTD.api.api object, optional
         A pyTD api object. If not passed, API requestor defaults to
         pyTD.api.default_api
+    candle_store: pyTD.cache.CandleStore, optional
+        Local store of candles. If passed, only the parts of the date range
+        which are not stored are requested, and retrieved candles are added
+        to the store. Only used if start_date or end_date is passed, and
+        not with the raw output format
+
+    Attributes
+    ----------
+    failures: dict
+        Errors of symbols which could not be retrieved during the last
+        execution, keyed by symbol
     """
 
+    # Longest range in milliseconds served in full by a single request, by
+    # frequency type. Longer ranges are split into several requests
+    _MAX_SPANS = {
+        "minute": 10 * _DAY,
+        "daily": 20 * 365 * _DAY,
+        "weekly": 20 * 365 * _DAY,
+        "monthly": 20 * 365 * _DAY
+    }
+
+    # Schema of the arrow output format, with one row per candle
+    _ARROW_FIELDS = (("symbol", "string"), ("datetime", "timestamp[ns]"),
+                     ("open", "float64"), ("high", "float64"),
+                     ("low", "float64"), ("close", "float64"),
+                     ("volume", "int64"))
+
     def __init__(self, symbols, **kwargs):
         self.period_type = kwargs.pop("period_type", "month")
         self.period = kwargs.pop("period", "")
         self.frequency_type = kwargs.pop("frequency_type", "daily")
         self.frequency = kwargs.pop("frequency", "")
+        # Only ranges passed by the caller are split or stored
+        self.ranged = (kwargs.get("start_date") is not None or
+                       kwargs.get("end_date") is not None)
         start = kwargs.pop("start_date", datetime.datetime(2018, 1, 1))
         end = kwargs.pop("end_date", datetime.datetime.today())
         self.need_extended = kwargs.pop("extended", "")
         self.output_format = kwargs.pop("output_format", 'pandas')
+        self.max_workers = kwargs.pop("max_workers", 1)
+        self.candle_store = kwargs.pop("candle_store", None)
+        self.failures = {}
         self.opt = kwargs
         api = kwargs.get("api")
         self.start, self.end = _sanitize_dates(start, end, set_defaults=False)
@@ -103,36 +228,219 @@ class PriceHistory(MarketData):
     def url(self):
         return "%s%s/{}/%s" % (self._BASE_URL, self.endpoint, self.resource)
 
+    @property
+    def cache_ttl(self):
+        # Candles of days which have closed do not change
+        if not self.end:
+            return None
+        today = datetime.datetime.combine(datetime.date.today(),
+                                          datetime.time())
+        if self.end < to_timestamp(today) * 1000:
+            return 7 * 24 * 3600
+        return None
+
     def _convert_output(self, out):
-        for sym in self.symbols:
+        for sym in out:
             out[sym] = self._convert_output_one(out[sym])
         return pd.concat(out.values(), keys=out.keys(), axis=1)
 
     def _convert_output_one(self, out):
-        df = pd.DataFrame(out)
-        df = df.set_index(pd.DatetimeIndex(df["datetime"]/1000*10**9))
-        df = df.drop("datetime", axis=1)
-        return df
+        try:
+            return _arrays_to_frame(*_candles_to_arrays(out))
+        except (KeyError, TypeError, ValueError):
+            # Candles without the usual fields
+            df = pd.DataFrame(out)
+            index = pd.to_datetime(df.pop("datetime"), unit="ms")
+            return df.set_index(pd.DatetimeIndex(index))
 
-    @auth_check
-    def execute(self):
-        result = {}
-        for sym in self.symbols:
-            data = self.get(url=self.url.format(sym))["candles"]
+    def _convert_arrow(self, out):
+        tables = []
+        for sym, candles in out.items():
+            try:
+                index, columns = _candles_to_arrays(candles)
+            except (KeyError, TypeError, ValueError):
+                # Candles without the usual fields
+                columns = {name: [c.get(name) for c in candles] for name, _
+                           in self._ARROW_FIELDS}
+                index = [None if t is None else t * 10 ** 6 for t in
+                         columns["datetime"]]
+            columns["datetime"] = index
+            columns["symbol"] = [sym] * len(candles)
+            tables.append(table_from_columns(columns, self._ARROW_FIELDS,
+                                             len(candles)))
+        return concat_tables(tables)
+
+    @property
+    def _use_store(self):
+        return (self.candle_store is not None and self.output_format != 'raw'
+                and self.ranged and bool(self.start) and bool(self.end))
+
+    @property
+    def _store_key(self):
+        # Candles differ by frequency and by the inclusion of extended hours
+        extended = str(self.need_extended).lower() in ("", "true")
+        return "%s-%s-%s" % (self.frequency_type, self.frequency or 1,
+                             "ext" if extended else "reg")
+
+    def _range_params(self, start, end):
+        params = self.params
+        params.update(startDate=start, endDate=end)
+        return params
+
+    def _plan(self, start, end):
+        """
+        Splits a range of epoch milliseconds into consecutive ranges which
+        the endpoint serves in full
+        """
+        span = self._MAX_SPANS.get(self.frequency_type)
+        if span is None:
+            return [(start, end)]
+        return [(s, min(s + span - 1, end)) for s in
+                range(start, end + 1, span)]
+
+    def _tasks(self):
+        """
+        (symbol, start, end) of each request of an execution. Requests of a
+        symbol's entire period have neither start nor end
+        """
+        if self._use_store:
+            return [(sym, s, e) for sym in self.symbols for gap in
+                    self.candle_store.missing(sym, self._store_key,
+                                              self.start, self.end)
+                    for s, e in self._plan(*gap)]
+        if (self.output_format == 'raw' or not self.ranged or
+                not (self.start and self.end)):
+            return [(sym, None, None) for sym in self.symbols]
+        return [(sym, s, e) for sym in self.symbols for s, e in
+                self._plan(self.start, self.end)]
+
+    def _fetch_task(self, task):
+        sym, start, end = task
+        if start is None:
+            return self._candles(sym, self.get(url=self.url.format(sym)))
+        return self._chunk(task, self.get(url=self.url.format(sym),
+                                          params=self._range_params(start,
+                                                                    end)))
+
+    def _chunk(self, task, data):
+        # Candles of a range, which may be empty. Candles for the store are
+        # converted to records
+        candles = data.get("candles") or []
+        if self._use_store:
+            try:
+                candles = _candles_to_records(candles)
+            except (KeyError, TypeError, ValueError):
+                raise TDQueryError(message="Price history for %s contains "
+                                   "malformed candles." % task[0])
+        return candles
+
+    def _stitch(self, tasks, result, failures):
+        """
+        Joins the candles of an execution's requests by symbol
+
+        Returns
+        -------
+        (candles, errors): tuple
+            Candles and errors keyed by symbol
+        """
+        if self._use_store:
+            self._store_chunks(tasks, result)
+        errors = OrderedDict()
+        for task, error in failures.items():
+            errors.setdefault(task[0], error)
+        chunks = OrderedDict((sym, []) for sym in self.symbols
+                             if sym not in errors)
+        for task in tasks:
+            if task[0] in chunks:
+                chunks[task[0]].append(result[task])
+        out = OrderedDict()
+        for sym, candles in chunks.items():
+            try:
+                out[sym] = self._join(sym, candles)
+            except ResourceNotFound as e:
+                errors[sym] = e
+        return out, errors
+
+    def _store_chunks(self, tasks, result):
+        # Adds the retrieved ranges of each symbol to the store at once,
+        # including those of symbols with failed requests
+        chunks = OrderedDict()
+        for task in tasks:
+            if task in result:
+                chunks.setdefault(task[0], []).append((task[1], task[2],
+                                                       result[task]))
+        for sym, ranges in chunks.items():
+            self.candle_store.update(sym, self._store_key, ranges)
+
+    def _join(self, sym, chunks):
+        if self._use_store:
+            return self._stored(sym)
+        if len(chunks) == 1:
+            candles = chunks[0]
+        else:
+            candles = _stitch_candles(chunks)
+            if self.output_format == 'json':
+                candles = _records_to_candles(candles)
+        if not len(candles):
+            FMT = "Price history for {} could not be retrieved"
+            raise ResourceNotFound(message=FMT.format(sym))
+        return candles
+
+    def _stored(self, sym):
+        candles = self.candle_store.read(sym, self._store_key, self.start,
+                                         self.end)
+        if not len(candles):
+            FMT = "Price history for {} could not be retrieved"
+            raise ResourceNotFound(message=FMT.format(sym))
+        if self.output_format == 'json':
+            return _records_to_candles(candles)
+        return candles
+
+    def _candles(self, sym, data):
+        # Returns the candles of a response, raising if there are none
+        if self.output_format == 'raw':
+            # Only small bodies can be empty
+            empty = data.small and not data.json().get("candles")
+        else:
+            data = data["candles"]
+            empty = not data
+        if empty:
             FMT = "Price history for {} could not be retrieved"
-            if not data:
-                raise ResourceNotFound(message=FMT.format(sym))
-            result[sym] = data
+            raise ResourceNotFound(message=FMT.format(sym))
+        return data
+
+    def _finish(self, result):
+        if not result:
+            if len(self.failures) == 1:
+                raise list(self.failures.values())[0]
+            raise ResourceNotFound(message="Price history for %s could not "
+                                   "be retrieved" % list(self.failures))
+        for sym, error in self.failures.items():
+            logger.warning("Price history for %s could not be retrieved: "
+                           "%s" % (sym, error))
         if len(self.symbols) == 1:
             return self._output_format_one(result)
         else:
             return self._output_format(result)
 
+    @auth_check
+    def execute(self):
+        tasks = self._tasks()
+        result, failures = _map_concurrent(self._fetch_task, tasks,
+                                           max_workers=self.max_workers,
+                                           catch=TDQueryError)
+        result, self.failures = self._stitch(tasks, result, failures)
+        return self._finish(result)
+
     def _output_format_one(self, out):
         out = out[self.symbols[0]]
         if self.output_format == 'json':
             return out
         elif self.output_format == 'pandas':
             return self._convert_output_one(out)
+        elif self.output_format == 'arrow':
+            return self._convert_arrow({self.symbols[0]: out})
+        elif self.output_format == 'raw':
+            return out
         else:
             raise ValueError("Please enter a valid output format.")
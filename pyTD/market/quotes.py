@@ -20,31 +20,113 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import logging
+import numpy as np
+
 from pyTD.auth import auth_check
 from pyTD.market.base import MarketData
-from pyTD.utils import _handle_lists
-from pyTD.utils.exceptions import ResourceNotFound
+from pyTD.utils import _handle_lists, _map_concurrent
+from pyTD.utils.arrow import table_from_rows
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
+
+logger = logging.getLogger(__name__)
 
 
 class Quotes(MarketData):
     """
     Class for retrieving data from the Get Quote and Get Quotes endpoints.
 
+    Symbols are requested in batches of up to 100 (the endpoint limit),
+    which are merged into a single result. Batches are subject to the
+    api's rate limit, if any.
+
     Parameters
     ----------
     symbols : string, array-like object (list, tuple, Series), or DataFrame
         Desired symbols for retrieval
     output_format: str, optional, default 'pandas'
-        Desired output format (json or Pandas DataFrame)
+        Desired output format (json, Pandas DataFrame, arrow, numpy, or raw).
+        The numpy format returns a structured array with one row per symbol
+        (see _NUMPY_DTYPE), which is reused by later executions of the same
+        instance. The raw format returns a list of the undecoded responses of
+        each batch
     api: pyTD.api.api object, optional
         A pyTD api object. If not passed, API requestor defaults to
         pyTD.api.default_api
+    batch_size: int, default 100, optional
+        Number of symbols per request (at most 100)
+    max_workers: int, default 1, optional
+        Number of batches to retrieve concurrently
+    fields: list-like, optional
+        Quote fields to keep (e.g. ["lastPrice", "totalVolume"]). If
+        passed, each batch is reduced to these fields and the symbol as it
+        is merged, and the arrow and numpy formats are limited to them. All
+        fields are kept by default
+
+    Attributes
+    ----------
+    failures: dict
+        Errors of batches which could not be retrieved during the last
+        execution, keyed by the batch's tuple of symbols
+    symbol_codes: dict
+        Code of each symbol in the numpy output format (its position in
+        symbols), keyed by the upper-cased symbol
     """
-    def __init__(self, symbols, output_format='pandas', api=None):
+    _MAX_SYMBOLS = 100
+
+    # Schema of the arrow output format
+    _ARROW_FIELDS = (
+        ("symbol", "string"), ("description", "string"),
+        ("assetType", "string"), ("cusip", "string"), ("exchange", "string"),
+        ("exchangeName", "string"), ("bidPrice", "float64"),
+        ("bidSize", "int64"), ("bidId", "string"), ("askPrice", "float64"),
+        ("askSize", "int64"), ("askId", "string"), ("lastPrice", "float64"),
+        ("lastSize", "int64"), ("lastId", "string"),
+        ("openPrice", "float64"), ("highPrice", "float64"),
+        ("lowPrice", "float64"), ("closePrice", "float64"),
+        ("netChange", "float64"), ("totalVolume", "int64"),
+        ("quoteTimeInLong", "timestamp[ms]"),
+        ("tradeTimeInLong", "timestamp[ms]"), ("mark", "float64"),
+        ("marginable", "bool"), ("shortable", "bool"),
+        ("volatility", "float64"), ("digits", "int64"),
+        ("52WkHigh", "float64"), ("52WkLow", "float64"),
+        ("peRatio", "float64"), ("divAmount", "float64"),
+        ("divYield", "float64"), ("divDate", "string"),
+        ("securityStatus", "string"),
+        ("regularMarketLastPrice", "float64"),
+        ("regularMarketLastSize", "int64"),
+        ("regularMarketNetChange", "float64"),
+        ("regularMarketTradeTimeInLong", "timestamp[ms]"),
+        ("delayed", "bool")
+    )
+
+    # Fields of the numpy output format. Prices are NaN and sizes and
+    # times (epoch milliseconds) 0 when not present in a quote
+    _NUMPY_FIELDS = (
+        ("bidPrice", "f8"), ("askPrice", "f8"), ("lastPrice", "f8"),
+        ("openPrice", "f8"), ("highPrice", "f8"), ("lowPrice", "f8"),
+        ("closePrice", "f8"), ("netChange", "f8"), ("mark", "f8"),
+        ("bidSize", "i8"), ("askSize", "i8"), ("lastSize", "i8"),
+        ("totalVolume", "i8"), ("quoteTimeInLong", "i8"),
+        ("tradeTimeInLong", "i8")
+    )
+
+    # The symbol field holds the symbol's code, or -1 if it was not returned
+    _NUMPY_DTYPE = np.dtype([("symbol", "i4")] + list(_NUMPY_FIELDS))
+
+    def __init__(self, symbols, output_format='pandas', api=None,
+                 batch_size=100, max_workers=1, fields=None):
         self.symbols = _handle_lists(symbols)
-        if len(self.symbols) > 100:
-            raise ValueError("Please input a valid symbol or list of up to "
-                             "100 symbols")
+        if not 0 < batch_size <= self._MAX_SYMBOLS:
+            raise ValueError("Please input a batch size of up to "
+                             "%d symbols" % self._MAX_SYMBOLS)
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.failures = {}
+        self.symbol_codes = dict((str(sym).upper(), i) for i, sym
+                                 in enumerate(self.symbols))
+        self._buffer = None
+        self._compile_fields(fields)
         super(Quotes, self).__init__(output_format, api)
 
     @property
@@ -57,11 +139,102 @@ class Quotes(MarketData):
             "symbol": ','.join(self.symbols)
         }
 
-    @auth_check
-    def execute(self):
-        data = self.get()
+    @property
+    def batches(self):
+        """Symbols split into tuples of at most batch_size symbols"""
+        n = self.batch_size
+        return [tuple(self.symbols[i:i+n]) for i in
+                range(0, len(self.symbols), n)]
+
+    def _compile_fields(self, fields):
+        """
+        Builds the field plan (the selected fields, in order) along with the
+        arrow and numpy layouts restricted to it
+        """
+        if fields is None:
+            self.fields = None
+            self._arrow_fields = self._ARROW_FIELDS
+            self._numpy_fields = self._NUMPY_FIELDS
+            self._numpy_dtype = self._NUMPY_DTYPE
+            return
+        fields = tuple(_handle_lists(fields))
+        if not fields:
+            raise ValueError("Please input at least one quote field.")
+        # Rows are matched to symbols by the symbol field
+        if "symbol" not in fields:
+            fields = ("symbol",) + fields
+        self.fields = fields
+        arrow_types = dict(self._ARROW_FIELDS)
+        numpy_types = dict(self._NUMPY_FIELDS)
+        self._arrow_fields = tuple((f, arrow_types[f]) for f in self.fields
+                                   if f in arrow_types)
+        self._numpy_fields = tuple((f, numpy_types[f]) for f in self.fields
+                                   if f in numpy_types)
+        self._numpy_dtype = np.dtype([("symbol", "i4")] +
+                                     list(self._numpy_fields))
+
+    def _project(self, data):
+        fields = self.fields
+        return dict((sym, dict((f, quote[f]) for f in fields if f in quote))
+                    for sym, quote in data.items())
+
+    def _convert_output(self, out):
+        import pandas as pd
+        if self.fields is None:
+            return pd.DataFrame(out)
+        return pd.DataFrame(out, index=list(self.fields))
+
+    def _convert_arrow(self, out):
+        return table_from_rows(list(out.values()), self._arrow_fields)
+
+    def _convert_numpy(self, out):
+        n = len(self.symbols)
+        if (self._buffer is None or len(self._buffer) != n or
+                self._buffer.dtype != self._numpy_dtype):
+            self._buffer = np.empty(n, dtype=self._numpy_dtype)
+        buf = self._buffer
+        codes = buf["symbol"]
+        codes.fill(-1)
+        quotes = [{}] * n
+        for sym, quote in out.items():
+            i = self.symbol_codes.get(sym.upper())
+            if i is not None:
+                quotes[i] = quote
+                codes[i] = i
+        for name, kind in self._numpy_fields:
+            fill = np.nan if kind == "f8" else 0
+            buf[name] = [q.get(name, fill) for q in quotes]
+        return buf
+
+    def _fetch_batch(self, batch):
+        data = self.get(params={"symbol": ','.join(batch)})
         if not data:
             raise ResourceNotFound(data, message="Quote for symbol %s not "
+                                   "found." % list(batch))
+        return data
+
+    def _merge_batches(self, result):
+        if not result:
+            if len(self.failures) == 1:
+                raise list(self.failures.values())[0]
+            raise ResourceNotFound(message="Quotes for symbols %s not "
                                    "found." % self.symbols)
-        else:
-            return self._output_format(data)
+        for batch, error in self.failures.items():
+            logger.warning("Quotes for symbols %s could not be retrieved: "
+                           "%s" % (list(batch), error))
+        if self.output_format == 'raw':
+            return list(result.values())
+        data = {}
+        for batch_data in result.values():
+            if self.fields is not None:
+                batch_data = self._project(batch_data)
+            data.update(batch_data)
+        return data
+
+    @auth_check
+    def execute(self):
+        result, self.failures = _map_concurrent(self._fetch_batch,
+                                                self.batches,
+                                                max_workers=self.max_workers,
+                                                catch=TDQueryError)
+        return self._output_format(self._merge_batches(result))
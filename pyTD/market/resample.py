@@ -0,0 +1,192 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import re
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from pyTD.compat import string_types
+from pyTD.market.price_history import _arrays_to_frame
+
+_UNITS = {"m": 60 * 10 ** 9, "min": 60 * 10 ** 9, "h": 3600 * 10 ** 9,
+          "d": 24 * 3600 * 10 ** 9}
+
+# Aggregation of each candle field. Other fields take their last value
+_AGGREGATIONS = {"open": "first", "high": "max", "low": "min",
+                 "close": "last", "volume": "sum"}
+
+
+def _parse_interval(interval):
+    """
+    Length in nanoseconds of an interval such as 5m, 15min, 1h or 1d
+    """
+    match = re.match(r"^(\d+)(m|min|h|d)$", str(interval))
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError("Please enter a valid interval (e.g. 5m, 1h, 1d).")
+    if match.group(2) == "d" and int(match.group(1)) != 1:
+        raise ValueError("Daily bars are only available for 1 day.")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def _nanoseconds(index):
+    """
+    int64 nanoseconds of a DatetimeIndex, whatever its resolution
+    """
+    return index.values.astype("datetime64[ns]").view(np.int64)
+
+
+def _stack(data):
+    """
+    Stacks the candles of all symbols of a price history DataFrame
+
+    Returns
+    -------
+    (symbols, codes, times, columns): tuple
+        Symbols (None for a single-symbol frame), the index of each candle's
+        symbol, int64 nanosecond times, and arrays of each field
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        symbols = list(OrderedDict.fromkeys(data.columns.get_level_values(0)))
+        frames = [data[sym] for sym in symbols]
+    else:
+        symbols = [None]
+        frames = [data]
+    codes, times = [], []
+    columns = OrderedDict((field, []) for field in frames[0].columns)
+    for code, frame in enumerate(frames):
+        # Rows of other symbols' candles in a multi-symbol frame
+        frame = frame.dropna(how="all").sort_index()
+        codes.append(np.full(len(frame), code, dtype=np.int64))
+        times.append(_nanoseconds(frame.index))
+        for field in columns:
+            columns[field].append(frame[field].values)
+    for field in columns:
+        columns[field] = np.concatenate(columns[field])
+    if "volume" in columns:
+        columns["volume"] = np.nan_to_num(columns["volume"]).astype(np.int64)
+    return symbols, np.concatenate(codes), np.concatenate(times), columns
+
+
+def _aggregate(codes, times, local, columns, width, offset):
+    """
+    Aggregates stacked candles into bars of width nanoseconds of local time
+
+    Returns
+    -------
+    (codes, labels, columns): tuple
+        Symbol index and start (in UTC) of each bar, and arrays of each
+        aggregated field
+    """
+    bins = (local - offset) // width
+    n = len(bins)
+    boundary = np.empty(n, dtype=bool)
+    boundary[:1] = True
+    np.not_equal(bins[1:], bins[:-1], out=boundary[1:])
+    boundary[1:] |= codes[1:] != codes[:-1]
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], n) - 1
+    # Bar starts, shifted from local time by each bar's first UTC offset
+    labels = times[starts] - (local[starts] - bins[starts] * width - offset)
+    out = OrderedDict()
+    for field, values in columns.items():
+        how = _AGGREGATIONS.get(field, "last")
+        if how == "first":
+            out[field] = values[starts]
+        elif how == "last":
+            out[field] = values[ends]
+        elif how == "max":
+            out[field] = np.fmax.reduceat(values, starts)
+        elif how == "min":
+            out[field] = np.fmin.reduceat(values, starts)
+        else:
+            out[field] = np.add.reduceat(values, starts)
+    return codes[starts], labels, out
+
+
+def _to_frame(symbols, codes, labels, columns):
+    if symbols == [None]:
+        return _arrays_to_frame(labels, columns)
+    # A single block of every symbol's fields, aligned on all bar starts
+    index = np.unique(labels)
+    rows = np.searchsorted(index, labels)
+    width = len(columns)
+    block = np.full((len(index), len(symbols) * width), np.nan)
+    for i, values in enumerate(columns.values()):
+        block[rows, codes * width + i] = values
+    columns = pd.MultiIndex.from_product([symbols, list(columns)])
+    index = pd.DatetimeIndex(index.view("datetime64[ns]"), name="datetime")
+    return pd.DataFrame(block, index=index, columns=columns)
+
+
+def resample(data, interval, tz="America/New_York", offset=None):
+    """
+    Aggregates candles into bars of a longer interval. Bars take the first
+    open, highest high, lowest low, last close and total volume of their
+    candles. All symbols are aggregated at once.
+
+    Bars are aligned to the clock of the exchange's time zone, so daily bars
+    span a trading session (including extended hours) rather than a UTC
+    day. Intervals without candles have no bar.
+
+    Parameters
+    ----------
+    data: pandas.DataFrame
+        Price history, as returned by pyTD.market.get_price_history, of one
+        or more symbols
+    interval: str or list-like
+        Bar interval (e.g. 5m, 15m, 1h, 1d), or a list of intervals
+    tz: str, default "America/New_York", optional
+        Time zone to align bars to. Bars are aligned to UTC if None
+    offset: str, optional
+        Shift of the bar boundaries (e.g. 30m to align hourly bars with a
+        09:30 open)
+
+    Returns
+    -------
+    bars: pandas.DataFrame or dict
+        Bars indexed by their start time (UTC), or a dict of bars keyed by
+        interval if a list of intervals was passed
+    """
+    intervals = [interval] if isinstance(interval, string_types) else \
+        list(interval)
+    widths = [_parse_interval(i) for i in intervals]
+    offset = _parse_interval(offset) if offset else 0
+    symbols, codes, times, columns = _stack(data)
+    if tz is None:
+        local = times
+    else:
+        local = pd.DatetimeIndex(times.view("datetime64[ns]"))
+        local = local.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+        local = _nanoseconds(local)
+    bars = OrderedDict()
+    for name, width in zip(intervals, widths):
+        if not len(times):
+            bars[name] = data.iloc[:0]
+            continue
+        bars[name] = _to_frame(symbols, *_aggregate(codes, times, local,
+                                                    columns, width, offset))
+    if isinstance(interval, string_types):
+        return bars[interval]
+    return bars
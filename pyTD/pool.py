@@ -0,0 +1,220 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+import threading
+
+from pyTD.api import api
+from pyTD.cache import SQLCache
+from pyTD.compat import monotonic
+from pyTD.utils.exceptions import (AuthorizationError, ConnectionError,
+                                   ServerError)
+
+logger = logging.getLogger(__name__)
+
+
+class _Member(object):
+    """
+    Load and health of one api in an ApiPool
+    """
+    def __init__(self, api):
+        self.api = api
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    @property
+    def quota(self):
+        limiter = self.api.rate_limiter
+        return float("inf") if limiter is None else limiter.available
+
+    def healthy(self, now):
+        return now >= self.unhealthy_until
+
+    def stats(self, now):
+        return {
+            "consumer_key": self.api.consumer_key,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "healthy": self.healthy(now)
+        }
+
+
+class ApiPool(object):
+    """
+    Pool of api objects, each with its own consumer key and token cache,
+    which may be passed to any resource in place of an api. Each request is
+    sent through the healthy credential with remaining rate limit quota and
+    the fewest requests in flight (then the fewest requests overall), so
+    that throughput scales with the number of credentials.
+
+    A credential is marked unhealthy for ``cooldown`` seconds after
+    ``max_failures`` consecutive server, connection, or authorization
+    errors, and failed requests are retried through the other credentials.
+    Tokens are validated (and access tokens refreshed) per credential, so
+    each credential needs a valid refresh token.
+
+    Parameters
+    ----------
+    apis: list of pyTD.api.api
+        The pooled apis
+    cooldown: float, default 30, optional
+        Seconds for which an unhealthy credential is not used
+    max_failures: int, default 3, optional
+        Consecutive failures after which a credential is marked unhealthy.
+        Authorization errors mark a credential unhealthy immediately
+    response_cache: pyTD.cache.ResponseCache, optional
+        Response cache shared by all pooled apis
+
+    Examples
+    --------
+
+    >>> pool = ApiPool([api(consumer_key=key, callback_url=uri,
+    ...                     rate_limit=120) for key in keys])
+    >>> pyTD.market.get_quotes(symbols, api=pool)
+    """
+    def __init__(self, apis, cooldown=30, max_failures=3,
+                 response_cache=None):
+        self.apis = list(apis)
+        if not self.apis:
+            raise ValueError("Please input at least one api.")
+        self.cooldown = cooldown
+        self.max_failures = max_failures
+        self.response_cache = response_cache
+        self.decoder = self.apis[0].decoder
+        self._members = [_Member(a) for a in self.apis]
+        self._lock = threading.Lock()
+        # Credentials are authorized individually in request
+        self._auth_deadline = float("inf")
+
+    @classmethod
+    def from_sql_cache(cls, path, callback_url, consumer_keys=None,
+                       **kwargs):
+        """
+        Creates a pool of apis whose tokens are stored in a SQLCache
+        database
+
+        Parameters
+        ----------
+        path: str
+            Path of the database file
+        callback_url: str
+            Redirect URI of the applications
+        consumer_keys: list, optional
+            Consumer keys to pool. Defaults to all keys in the database
+        kwargs: additional api parameters (e.g. rate_limit)
+        """
+        if consumer_keys is None:
+            consumer_keys = SQLCache(path, "").consumer_keys()
+        apis = [api(consumer_key=key, callback_url=callback_url,
+                    cache=SQLCache(path, key), **kwargs)
+                for key in consumer_keys]
+        return cls(apis)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __repr__(self):
+        return "ApiPool(%s)" % ", ".join(a.consumer_key for a in self.apis)
+
+    @property
+    def stats(self):
+        """Load and health of each credential"""
+        now = monotonic()
+        with self._lock:
+            return [m.stats(now) for m in self._members]
+
+    @property
+    def auth_valid(self):
+        """Validity of the tokens of all credentials"""
+        return all(a.auth_valid for a in self.apis)
+
+    def _update_auth_deadline(self):
+        return
+
+    def _select(self, exclude):
+        now = monotonic()
+        with self._lock:
+            members = [m for m in self._members if m not in exclude]
+            if not members:
+                return None
+            healthy = [m for m in members if m.healthy(now)]
+            # Fall back to the credential which recovers first
+            if not healthy:
+                healthy = [min(members, key=lambda m: m.unhealthy_until)]
+            member = min(healthy, key=lambda m: (m.quota < 1, m.in_flight,
+                                                 -m.quota, m.requests))
+            member.in_flight += 1
+            member.requests += 1
+            return member
+
+    def _release(self, member, error=None):
+        with self._lock:
+            member.in_flight -= 1
+            if error is None:
+                member.consecutive_failures = 0
+                return
+            member.failures += 1
+            member.consecutive_failures += 1
+            if (isinstance(error, AuthorizationError) or
+                    member.consecutive_failures >= self.max_failures):
+                member.unhealthy_until = monotonic() + self.cooldown
+                logger.warning("Credential %s marked unhealthy for %s "
+                               "seconds: %s" % (member.api.consumer_key,
+                                                self.cooldown, error))
+
+    @staticmethod
+    def _authorize(member):
+        a = member.api
+        if monotonic() >= a._auth_deadline:
+            if a.auth_valid is not True:
+                a.auth.refresh_access_token()
+            a._update_auth_deadline()
+
+    def request(self, method, url, **kwargs):
+        tried = []
+        error = None
+        while True:
+            member = self._select(tried)
+            if member is None:
+                raise error
+            tried.append(member)
+            try:
+                self._authorize(member)
+                # Each attempt needs its own copy of the mutable arguments
+                attempt = dict(kwargs)
+                for key in ("headers", "params"):
+                    if key in attempt:
+                        attempt[key] = dict(attempt[key])
+                response = member.api.request(method, url, **attempt)
+            except (AuthorizationError, ConnectionError, ServerError) as e:
+                self._release(member, e)
+                error = e
+                continue
+            except Exception:
+                self._release(member)
+                raise
+            self._release(member)
+            return response
@@ -24,6 +24,7 @@ import logging
 
 from pyTD import BASE_URL
 from pyTD.api import default_api
+from pyTD.utils.decoders import loads
 from pyTD.utils.exceptions import TDQueryError
 
 logger = logging.getLogger(__name__)
@@ -50,6 +51,14 @@ class Resource(object):
     def data(self):
         return {}
 
+    @property
+    def cache_ttl(self):
+        """
+        Time-to-live in seconds of responses in the api's response cache.
+        Responses are not cached if None
+        """
+        return None
+
     @property
     def headers(self):
         return {
@@ -57,6 +66,68 @@ class Resource(object):
         }
 
 
+class RawResponse(object):
+    """
+    Undecoded response of a resource executed with ``output_format='raw'``
+
+    Attributes
+    ----------
+    data: memoryview
+        Response body
+    url: str
+        Request URL
+    status_code: int
+        HTTP status code
+    headers: dict
+        Response headers
+    """
+    # Error and empty payloads are small, so only bodies of up to SCAN_SIZE
+    # bytes are ever inspected
+    SCAN_SIZE = 4096
+
+    def __init__(self, data, url=None, status_code=None, headers=None,
+                 decoder=None):
+        self.data = data
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._decoder = decoder or loads
+
+    def __repr__(self):
+        return "RawResponse(url= %s, status_code = %s, size = %s)" % (
+            self.url, self.status_code, len(self))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bool__(self):
+        # False for empty JSON objects and arrays
+        if not self.small:
+            return True
+        return self.tobytes().strip() not in (b"", b"{}", b"[]")
+
+    __nonzero__ = __bool__
+
+    @property
+    def small(self):
+        """Whether the body is small enough to be inspected"""
+        return len(self.data) <= self.SCAN_SIZE
+
+    def contains(self, token):
+        """
+        Whether the body is small and contains the bytes token. Does not
+        decode the body
+        """
+        return self.small and token in self.tobytes()
+
+    def tobytes(self):
+        return self.data.tobytes()
+
+    def json(self):
+        """Decodes the body"""
+        return self._decoder(self.data)
+
+
 class Get(Resource):
     """
     GET requests
@@ -65,11 +136,55 @@ class Get(Resource):
         params = params or self.params
         url = url or self.url
 
-        response = self.api.request("GET", url=url, params=params)
+        if getattr(self, "output_format", None) == "raw":
+            response = self.api.request("GET", url=url, params=params)
+            return self._raw_response(response)
 
-        # Convert GET requests to JSON
+        key, ttl = self._cache_lookup(url, params)
+        if key is not None:
+            data = self.api.response_cache.get(key)
+            if data is not None:
+                return data
+
+        response = self.api.request("GET", url=url, params=params)
+        data = self._decode_response(response)
+        if key is not None:
+            self.api.response_cache.set(key, data, ttl)
+        return data
+
+    def _cache_lookup(self, url, params):
+        """
+        Returns the response cache key and time-to-live of a request, or
+        (None, None) if it should not be cached
+        """
+        cache = getattr(self.api, "response_cache", None)
+        if cache is None:
+            return None, None
+        ttl = cache.ttl(self)
+        if not ttl:
+            return None, None
+        return cache.key(url, params), ttl
+
+    def _raw_response(self, response):
+        raw = RawResponse(memoryview(response.content), url=response.url,
+                          status_code=response.status_code,
+                          headers=getattr(response, "headers", None),
+                          decoder=self.api.decoder)
+        # Only error payloads need decoding
+        if raw.contains(b'"error"'):
+            try:
+                json_data = raw.json()
+            except ValueError:
+                raise TDQueryError(message="An error occurred during the "
+                                   "query.", response=response)
+            if isinstance(json_data, dict) and "error" in json_data:
+                raise TDQueryError(response=response)
+        return raw
+
+    def _decode_response(self, response):
+        # Decode GET responses directly from the response bytes
         try:
-            json_data = response.json()
+            json_data = self.api.decoder(response.content)
         except ValueError:
             raise TDQueryError(message="An error occurred during the query.",
                                response=response)
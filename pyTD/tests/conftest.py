@@ -21,6 +21,8 @@
 # SOFTWARE.
 
 # flake8: noqa
+import sys
+
 import pytest
 
 # fixture routing
@@ -28,11 +30,16 @@ from pyTD.tests.fixtures import sample_oid
 from pyTD.tests.fixtures import sample_uri
 from pyTD.tests.fixtures import valid_refresh_token, valid_access_token
 from pyTD.tests.fixtures import set_env, del_env
-from pyTD.tests.fixtures import valid_cache, invalid_cache
+from pyTD.tests.fixtures import valid_cache, invalid_cache, valid_api
 
 # mock responses routing
 from pyTD.tests.fixtures.mock_responses import mock_400
 
+# the aio tests use async/await syntax, which Python < 3.5 cannot compile
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append("unit/test_aio.py")
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -24,6 +24,7 @@ import datetime
 
 import pytest
 
+from pyTD.api import api
 from pyTD.auth.tokens import RefreshToken, AccessToken
 from pyTD.cache import MemCache
 from pyTD.utils import to_timestamp
@@ -62,6 +63,12 @@ def invalid_cache():
     return c
 
 
+@pytest.fixture(scope='function')
+def valid_api(valid_cache, sample_oid, sample_uri):
+    return api(consumer_key=sample_oid, callback_url=sample_uri,
+               cache=valid_cache, pause=0)
+
+
 @pytest.fixture(scope='session')
 def valid_refresh_token():
     return RefreshToken(valid_params)
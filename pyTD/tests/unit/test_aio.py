@@ -0,0 +1,158 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import json
+import pytest
+import requests
+import time
+
+from urllib.parse import parse_qsl, urlparse
+
+from pyTD import aio
+from pyTD.auth.tokens import AccessToken
+from pyTD.utils.exceptions import AuthorizationError, ResourceNotFound
+
+yarl = pytest.importorskip("yarl")
+
+
+class MockAsyncResponse(object):
+
+    def __init__(self, text, status):
+        self.text = text
+        self.status = status
+        self.reason = "OK" if status == 200 else "Error"
+        self.headers = {}
+        self.url = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return self.text.encode()
+
+    def get_encoding(self):
+        return "utf-8"
+
+
+class MockAsyncSession(object):
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        for fragment, (text, status) in self.responses.items():
+            if fragment in url:
+                r = MockAsyncResponse(text, status)
+                break
+        else:
+            r = MockAsyncResponse('{"error": "Not Found."}', 404)
+        r.url = url
+        return r
+
+
+@pytest.fixture(scope='function')
+def async_api(valid_cache, sample_oid, sample_uri):
+    candles = {"candles": [{"open": 1.0, "high": 2.0, "low": 0.5,
+                            "close": 1.5, "volume": 100,
+                            "datetime": 1514872800000}]}
+    session = MockAsyncSession({
+        "/quotes": (json.dumps({"AAPL": {"lastPrice": 200.0}}), 200),
+        "/AAPL/pricehistory": (json.dumps(candles), 200),
+        "/BAD/pricehistory": ('{"candles": []}', 200),
+    })
+    return aio.api(consumer_key=sample_oid, callback_url=sample_uri,
+                   cache=valid_cache, session=session, pause=0)
+
+
+def run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+class TestAsyncAPI(object):
+
+    def test_quotes(self, async_api):
+        data = run(aio.Quotes("AAPL", api=async_api,
+                              output_format='json').execute())
+
+        assert data == {"AAPL": {"lastPrice": 200.0}}
+        method, url, kwargs = async_api.session.requests[0]
+        assert kwargs["params"]["apikey"] == async_api.consumer_key
+        assert kwargs["headers"]["authorization"] == "Bearer validtoken"
+
+    def test_price_history(self, async_api):
+        ph = aio.PriceHistory(["AAPL", "BAD"], api=async_api,
+                              output_format='json', extended=True)
+        data = run(ph.execute())
+
+        assert list(data) == ["AAPL"]
+        assert isinstance(ph.failures["BAD"], ResourceNotFound)
+        for _, _, kwargs in async_api.session.requests:
+            assert kwargs["params"]["needExtendedHoursData"] == "true"
+
+    def test_options_query(self, async_api):
+        chain = {"status": "SUCCESS", "callExpDateMap": {},
+                 "putExpDateMap": {}}
+        async_api.session.responses["/chains"] = (json.dumps(chain), 200)
+        options = aio.Options(["SPX", "SPY"], api=async_api,
+                              output_format='json')
+        run(options.execute())
+
+        _, url, kwargs = async_api.session.requests[0]
+        query = yarl.URL(url).with_query(kwargs["params"]).query_string
+        expected = requests.Request("GET", url, params=dict(
+            options.params, apikey=async_api.consumer_key)).prepare().url
+        assert parse_qsl(query) == parse_qsl(urlparse(expected).query)
+        assert query.startswith("symbol=SPX&symbol=SPY")
+
+    def test_instruments_arrow(self, async_api):
+        pa = pytest.importorskip("pyarrow")
+        async_api.session.responses["/instruments"] = (json.dumps({
+            "AAPL": {"symbol": "AAPL", "cusip": "037833100",
+                     "exchange": "NASDAQ"}}), 200)
+        table = run(aio.Instruments("AAPL", api=async_api,
+                                    output_format='arrow').execute())
+
+        assert isinstance(table, pa.Table)
+        assert table.column("cusip").to_pylist() == ["037833100"]
+
+    def test_request_errors(self, async_api):
+        with pytest.raises(ResourceNotFound):
+            run(async_api.request("GET", "https://none.com"))
+
+    def test_unauthorized_replayed(self, async_api, monkeypatch):
+        monkeypatch.setattr(async_api.auth, "_request_access_token",
+                            lambda: AccessToken(token="newtoken",
+                                                access_time=time.time(),
+                                                expires_in=1800))
+        async_api.session.responses["/revoked"] = ("Error", 401)
+
+        with pytest.raises(AuthorizationError):
+            run(async_api.request("GET", "https://none.com/revoked"))
+        requests = async_api.session.requests
+        assert len(requests) == 2
+        assert requests[1][2]["headers"]["authorization"] == "Bearer newtoken"
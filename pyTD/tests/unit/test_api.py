@@ -22,13 +22,17 @@
 
 import pytest
 import subprocess
+import threading
+import time
 
 from pyTD.api import api, default_api, gen_ssl
+from pyTD.auth.tokens import AccessToken
 from pyTD.utils.exceptions import (SSLError, ConfigurationError,
                                    ValidationError, AuthorizationError,
                                    ForbiddenAccess, ResourceNotFound,
                                    ClientError, ServerError)
-from pyTD.utils.testing import MockResponse
+from pyTD.utils.retry import RetryPolicy
+from pyTD.utils.testing import MockResponse, MockSession
 
 
 @pytest.fixture(params=[
@@ -72,6 +76,15 @@ class TestAPI(object):
         assert a.access_valid is True
         assert a.auth_valid is True
 
+    def test_api_rate_limit(self, sample_oid, sample_uri, valid_cache):
+        a = api(consumer_key=sample_oid, callback_url=sample_uri,
+                cache=valid_cache, rate_limit=1, rate_period=60)
+        a.session = sesh(MockResponse("{}", 200))
+
+        assert a.rate_limiter.rate == 1
+        a.request("GET", "https://none.com")
+        assert a.rate_limiter.available < 1
+
 
 class TestDefaultAPI(object):
 
@@ -122,6 +135,123 @@ class TestAPIRequest(object):
             api.request("GET", "https://none.com")
 
 
+class TestAPIReauthorize(object):
+
+    @pytest.fixture(scope='function')
+    def refreshes(self, valid_api, monkeypatch):
+        refreshes = []
+
+        def request_access_token():
+            refreshes.append(1)
+            return AccessToken(token="newtoken", access_time=time.time(),
+                               expires_in=1800)
+        monkeypatch.setattr(valid_api.auth, "_request_access_token",
+                            request_access_token)
+        return refreshes
+
+    @staticmethod
+    def respond(method, url, headers=None, **kwargs):
+        if headers["authorization"] == "Bearer newtoken":
+            return MockResponse("{}", 200)
+        return MockResponse("Error", 401)
+
+    def test_unauthorized_replayed(self, valid_api, refreshes):
+        valid_api.session = MockSession({"none": self.respond})
+
+        response = valid_api.request("GET", "https://none.com")
+        assert response.status_code == 200
+        assert len(valid_api.session.requests) == 2
+        assert valid_api.access_token.token == "newtoken"
+        assert refreshes == [1]
+
+    def test_unauthorized_replayed_once(self, valid_api, refreshes):
+        valid_api.session = MockSession({"none": MockResponse("Error", 401)})
+
+        with pytest.raises(AuthorizationError):
+            valid_api.request("GET", "https://none.com")
+        assert len(valid_api.session.requests) == 2
+        assert refreshes == [1]
+
+    def test_concurrent_refreshes_coalesced(self, valid_api, refreshes):
+        valid_api.session = MockSession({"none": self.respond})
+        start = threading.Event()
+
+        def request():
+            start.wait()
+            return valid_api.request("GET", "https://none.com")
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for t in threads:
+            t.start()
+        start.set()
+        for t in threads:
+            t.join()
+        assert refreshes == [1]
+
+
+class TestAPIRetry(object):
+
+    @pytest.fixture(scope='function')
+    def sleeps(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("pyTD.api.time.sleep", sleeps.append)
+        return sleeps
+
+    def test_permanent_error_not_retried(self, valid_api, sleeps):
+        valid_api.session = MockSession()
+
+        with pytest.raises(ResourceNotFound):
+            valid_api.request("GET", "https://none.com")
+        assert len(valid_api.session.requests) == 1
+        assert sleeps == []
+
+    def test_transient_error_retried(self, valid_api, sleeps):
+        responses = [MockResponse("{}", 200), MockResponse("Error", 503)]
+        valid_api.session = MockSession({
+            "none": lambda *a, **k: responses.pop()
+        })
+        valid_api.retry_policy = RetryPolicy(total=3, backoff_factor=1,
+                                             jitter=False)
+
+        response = valid_api.request("GET", "https://none.com")
+        assert response.retries == 1
+        assert sleeps == [1]
+
+    def test_retry_exhausted(self, valid_api, sleeps):
+        valid_api.session = MockSession({"none": MockResponse("Error", 502)})
+        valid_api.retry_policy = RetryPolicy(total=3, backoff_factor=1,
+                                             jitter=False)
+
+        with pytest.raises(ServerError):
+            valid_api.request("GET", "https://none.com")
+        assert len(valid_api.session.requests) == 4
+        assert sleeps == [1, 2, 4]
+
+    def test_retry_after(self, valid_api, sleeps):
+        throttled = MockResponse("Error", 429)
+        throttled.headers = {"Retry-After": "7"}
+        responses = [MockResponse("{}", 200), throttled]
+        valid_api.session = MockSession({
+            "none": lambda *a, **k: responses.pop()
+        })
+
+        valid_api.request("GET", "https://none.com")
+        assert sleeps == [7.0]
+
+    def test_retry_after_capped(self):
+        throttled = MockResponse("Error", 429)
+        throttled.headers = {"Retry-After": "86400"}
+        policy = RetryPolicy(max_backoff=5)
+
+        assert policy.backoff(0, throttled) == 5
+
+    def test_backoff_jitter(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for retries in range(6):
+            assert 0 <= policy.backoff(retries) <= min(5, 2 ** retries)
+
+
 class TestGenSSL(object):
 
     def test_gen_ssl_pass(self, monkeypatch):
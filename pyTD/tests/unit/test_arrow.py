@@ -0,0 +1,124 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import pytest
+
+from pyTD.instruments import Instruments
+from pyTD.market import MarketHours, Movers, Options, PriceHistory, Quotes
+from pyTD.utils.testing import MockResponse, MockSession
+
+pa = pytest.importorskip("pyarrow")
+
+
+def respond(fragment, data):
+    return {fragment: MockResponse(json.dumps(data), 200)}
+
+
+class TestArrowOutput(object):
+
+    def test_quotes(self, valid_api):
+        valid_api.session = MockSession(respond("quotes", {
+            "AAPL": {"symbol": "AAPL", "lastPrice": 190.5, "bidSize": 200,
+                     "quoteTimeInLong": 1514872800000, "marginable": True,
+                     "unknownField": "ignored"},
+            "TSLA": {"symbol": "TSLA", "lastPrice": "NaN"}
+        }))
+        table = Quotes(["AAPL", "TSLA"], api=valid_api,
+                       output_format='arrow').execute()
+
+        assert isinstance(table, pa.Table)
+        assert table.schema.field("lastPrice").type == pa.float64()
+        assert table.schema.field("bidSize").type == pa.int64()
+        assert table.schema.field("quoteTimeInLong").type == \
+            pa.timestamp("ms")
+        assert "unknownField" not in table.schema.names
+        assert table.column("symbol").to_pylist() == ["AAPL", "TSLA"]
+        assert table.column("bidSize").to_pylist() == [200, None]
+
+    def test_price_history(self, valid_api):
+        candles = {"candles": [{"open": 1.0, "high": 2.0, "low": 0.5,
+                                "close": 1.5, "volume": 100,
+                                "datetime": 1514872800000}]}
+        valid_api.session = MockSession(respond("pricehistory", candles))
+        table = PriceHistory(["AAPL", "TSLA"], api=valid_api,
+                             output_format='arrow').execute()
+
+        assert table.num_rows == 2
+        assert table.column("symbol").to_pylist() == ["AAPL", "TSLA"]
+        assert table.column("datetime").type == pa.timestamp("ns")
+        assert table.column("volume").to_pylist() == [100, 100]
+
+    def test_options(self, valid_api):
+        contract = {"putCall": "CALL", "symbol": "SPX_C2500", "bid": 1.5,
+                    "totalVolume": 10, "expirationDate": 1547845200000}
+        chain = {"status": "SUCCESS",
+                 "callExpDateMap": {"2019-01-18:30": {"2500.0": [contract]}},
+                 "putExpDateMap": {}}
+        valid_api.session = MockSession(respond("chains", chain))
+        table = Options("SPX", api=valid_api, output_format='arrow').execute()
+
+        assert table.num_rows == 1
+        assert table.column("strike").to_pylist() == [2500.0]
+        assert table.column("expDate").to_pylist() == ["2019-01-18:30"]
+
+        pytest.importorskip("ijson")
+        streamed = Options("SPX", api=valid_api, output_format='arrow',
+                           stream=True).execute()
+        assert streamed.equals(table)
+
+    def test_movers(self, valid_api):
+        valid_api.session = MockSession(respond("movers", [
+            {"symbol": "AAPL", "change": 0.05, "last": 190.5,
+             "totalVolume": 1000, "direction": "up"}
+        ]))
+        table = Movers("$DJI", api=valid_api, output_format='arrow').execute()
+
+        assert table.column("change").to_pylist() == [0.05]
+
+    def test_market_hours(self, valid_api):
+        session = [{"start": "2018-07-05T09:30:00-04:00",
+                    "end": "2018-07-05T16:00:00-04:00"}]
+        valid_api.session = MockSession(respond("hours", {
+            "equity": {"EQ": {"date": "2018-07-05", "marketType": "EQUITY",
+                              "product": "EQ", "isOpen": True,
+                              "sessionHours": {"regularMarket": session}}}
+        }))
+        table = MarketHours(api=valid_api, output_format='arrow').execute()
+
+        row = table.to_pylist()[0]
+        assert row["market"] == "equity"
+        assert row["isOpen"] is True
+        assert row["regularMarketStart"] == "2018-07-05T09:30:00-04:00"
+        assert row["preMarketStart"] is None
+
+    def test_fundamentals(self, valid_api):
+        valid_api.session = MockSession(respond("instruments", {
+            "AAPL": {"symbol": "AAPL", "cusip": "037833100",
+                     "fundamental": {"symbol": "AAPL", "peRatio": 17.5,
+                                     "marketCap": 900000.0}}
+        }))
+        table = Instruments("AAPL", projection="fundamental", api=valid_api,
+                            output_format='arrow').execute()
+
+        assert table.num_columns == 46
+        assert table.column("peRatio").to_pylist() == [17.5]
@@ -22,14 +22,20 @@
 
 import json
 import pytest
+import requests
+import threading
+import time
 from pyTD.compat import MagicMock
 
-from pyTD.auth import TDAuthManager
-from pyTD.cache import MemCache
+from pyTD.api import api
+from pyTD.auth import TDAuthManager, TokenRefresher, auth_check
+from pyTD.cache import DiskCache, MemCache
 from pyTD.auth.server import TDAuthServer
 from pyTD.auth.tokens import EmptyToken, RefreshToken, AccessToken
-from pyTD.utils.exceptions import AuthorizationError
-from pyTD.utils.testing import MockResponse
+from pyTD.compat import monotonic
+from pyTD.utils.exceptions import AuthorizationError, ConnectionError
+from pyTD.utils.retry import RetryPolicy
+from pyTD.utils.testing import MockResponse, MockSession
 
 
 @pytest.fixture(scope='function', autouse=True)
@@ -103,10 +109,8 @@ class TestAuth(object):
                                            mock_400, sample_oid, sample_uri):
         c = invalid_cache
         c.refresh_token.expires_in = 100000000000
-        monkeypatch.setattr("pyTD.auth.manager.requests.post", lambda *a, **k:
-                            mock_400)
-
-        manager = TDAuthManager(c, sample_oid, sample_uri)
+        manager = TDAuthManager(c, sample_oid, sample_uri,
+                                session=MockSession({"token": mock_400}))
         with pytest.raises(AuthorizationError):
             manager.refresh_access_token()
 
@@ -114,9 +118,162 @@ class TestAuth(object):
                                  sample_oid, sample_uri, valid_cache):
 
         mocked_response = MockResponse(json.dumps(test_auth_response), 200)
-        monkeypatch.setattr("pyTD.auth.manager.requests.post", lambda *a, **k:
-                            mocked_response)
+        session = MockSession({"token": mocked_response})
+
+        manager = TDAuthManager(valid_cache, sample_oid, sample_uri,
+                                session=session)
+        manager.refresh_access_token()
+        assert manager.access_token.token == "TESTACCESSVALUE"
+
+    def test_auth_refresh_retried(self, test_auth_response, sample_oid,
+                                  sample_uri, valid_cache):
+        responses = [MockResponse(json.dumps(test_auth_response), 200),
+                     MockResponse("Error", 503)]
+        session = MockSession({"token": lambda *a, **k: responses.pop()})
+        policy = RetryPolicy(total=2, backoff_factor=0)
 
-        manager = TDAuthManager(valid_cache, sample_oid, sample_uri)
+        manager = TDAuthManager(valid_cache, sample_oid, sample_uri,
+                                session=session, timeout=(1, 2),
+                                retry_policy=policy)
         manager.refresh_access_token()
         assert manager.access_token.token == "TESTACCESSVALUE"
+        assert all(kwargs["timeout"] == (1, 2)
+                   for _, _, kwargs in session.requests)
+
+        stats = manager.stats
+        assert stats["refreshes"] == 1
+        assert stats["retries"] == 1
+        assert stats["failures"] == 0
+        assert stats["last_duration"] >= 0
+
+    def test_auth_refresh_timeout(self, sample_oid, sample_uri,
+                                  valid_cache):
+        def timeout(*args, **kwargs):
+            raise requests.exceptions.Timeout("Read timed out.")
+        session = MockSession({"token": timeout})
+        policy = RetryPolicy(total=2, backoff_factor=0)
+
+        manager = TDAuthManager(valid_cache, sample_oid, sample_uri,
+                                session=session, retry_policy=policy)
+        with pytest.raises(ConnectionError):
+            manager.refresh_access_token()
+        assert len(session.requests) == 3
+        assert manager.stats["failures"] == 1
+
+    def test_auth_refresh_single_refresher(self, test_auth_response,
+                                           monkeypatch, sample_oid,
+                                           sample_uri, valid_cache):
+        posts = []
+
+        def post(*args, **kwargs):
+            posts.append(1)
+            time.sleep(0.05)
+            return MockResponse(json.dumps(test_auth_response), 200)
+
+        stale = valid_cache.access_token
+        manager = TDAuthManager(valid_cache, sample_oid, sample_uri,
+                                session=MockSession({"token": post}))
+        threads = [threading.Thread(target=manager.refresh_access_token,
+                                    args=(stale,)) for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert posts == [1]
+        assert manager.access_token.token == "TESTACCESSVALUE"
+
+    def test_auth_refresh_reuses_other_process(self, tmpdir, monkeypatch,
+                                               sample_oid, sample_uri,
+                                               valid_refresh_token,
+                                               valid_access_token):
+        c1 = DiskCache(str(tmpdir), "TEST")
+        c1.refresh_token = valid_refresh_token
+        c1.access_token = valid_access_token
+        c2 = DiskCache(str(tmpdir), "TEST")
+        stale = c2.access_token
+
+        new = AccessToken(token="newtoken", access_time=int(time.time()),
+                          expires_in=1800)
+        c1.access_token = new
+
+        session = MockSession({"token": lambda *a, **k:
+                               pytest.fail("Token requested")})
+        manager = TDAuthManager(c2, sample_oid, sample_uri, session=session)
+        assert manager.refresh_access_token(stale) == new
+
+
+class Resource(object):
+
+    def __init__(self, api):
+        self.api = api
+
+    @auth_check
+    def execute(self):
+        return True
+
+
+class TestAuthCheck(object):
+
+    @pytest.fixture(scope='function')
+    def validations(self, monkeypatch):
+        validations = []
+
+        def auth_valid(self):
+            validations.append(1)
+            return self.refresh_valid and self.access_valid
+
+        monkeypatch.setattr(api, "auth_valid", property(auth_valid))
+        return validations
+
+    def test_auth_check_fast_path(self, valid_api, validations):
+        r = Resource(valid_api)
+
+        assert r.execute() is True
+        assert validations == [1]
+        assert valid_api._auth_deadline > monotonic()
+
+        for i in range(3):
+            assert r.execute() is True
+        assert validations == [1]
+
+    def test_auth_check_near_expiry(self, valid_api, validations):
+        valid_api.access_token.expires_in = 15030
+        r = Resource(valid_api)
+
+        r.execute()
+        r.execute()
+        assert validations == [1, 1]
+
+
+class TestTokenRefresher(object):
+
+    def test_seconds_until_refresh(self, valid_api):
+        refresher = TokenRefresher(valid_api, margin=300)
+        expiry = valid_api.access_token.expiry
+
+        assert refresher.seconds_until_refresh() == pytest.approx(
+            expiry - 300 - time.time(), abs=1)
+
+        valid_api.access_token.expires_in = 15100
+        assert refresher.seconds_until_refresh() == 0
+
+    def test_background_refresh(self, valid_api, monkeypatch):
+        valid_api.access_token.expires_in = 15100
+        refreshed = threading.Event()
+
+        def refresh_access_token():
+            valid_api.cache.access_token = AccessToken(
+                token="newtoken", access_time=int(time.time()),
+                expires_in=1800)
+            refreshed.set()
+
+        monkeypatch.setattr(valid_api.auth, "refresh_access_token",
+                            refresh_access_token)
+        valid_api.start_refresher()
+        try:
+            assert refreshed.wait(5)
+        finally:
+            valid_api.stop_refresher(timeout=5)
+        assert valid_api.access_token.token == "newtoken"
+        assert valid_api.refresher is None
@@ -21,9 +21,16 @@
 # SOFTWARE.
 
 import pytest
+import socket
+import threading
+import time
 
-from pyTD.cache import MemCache
-from pyTD.auth.tokens import EmptyToken
+from pyTD.api import api
+from pyTD.auth.broker import TokenBroker
+from pyTD.cache import (BrokerCache, CandleStore, DiskCache, MemCache,
+                        ResponseCache, SQLCache)
+from pyTD.auth.tokens import AccessToken, EmptyToken
+from pyTD.utils.exceptions import ConfigurationError, ConnectionError
 
 
 @pytest.fixture(scope='function', autouse=True)
@@ -54,3 +61,293 @@ class TestMemCache(object):
         c.clear()
         assert isinstance(c.refresh_token, EmptyToken)
         assert isinstance(c.access_token, EmptyToken)
+
+
+class Resource(object):
+    cache_ttl = 60
+
+
+class TestResponseCache(object):
+
+    def test_key_canonical(self):
+        k1 = ResponseCache.key("url", {"b": 1, "a": "x", "apikey": "KEY"})
+        k2 = ResponseCache.key("url", {"a": "x", "b": 1})
+
+        assert k1 == k2
+
+    def test_hit_miss(self):
+        c = ResponseCache()
+
+        assert c.get("key") is None
+        c.set("key", {"data": 1}, 60)
+        assert c.get("key") == {"data": 1}
+        assert c.stats == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("pyTD.cache.response_cache.monotonic",
+                            lambda: now[0])
+        c = ResponseCache()
+        c.set("key", {"data": 1}, 60)
+
+        now[0] += 61
+        assert c.get("key") is None
+        assert len(c) == 0
+
+    def test_lru_eviction(self):
+        c = ResponseCache(maxsize=2)
+        c.set("a", 1, 60)
+        c.set("b", 2, 60)
+        c.get("a")
+        c.set("c", 3, 60)
+
+        assert c.get("b") is None
+        assert c.get("a") == 1
+        assert c.get("c") == 3
+
+    def test_disk_tier(self, tmpdir):
+        c = ResponseCache(cache_dir=str(tmpdir))
+        c.set("key", {"data": 1}, 60)
+
+        c2 = ResponseCache(cache_dir=str(tmpdir))
+        assert c2.get("key") == {"data": 1}
+        assert len(c2) == 1
+
+    def test_ttl_override(self):
+        c = ResponseCache(ttls={"Resource": 5})
+
+        assert c.ttl(Resource()) == 5
+        assert ResponseCache().ttl(Resource()) == 60
+
+
+class TestDiskCache(object):
+
+    def test_set_get(self, tmpdir, valid_refresh_token, valid_access_token):
+        c = DiskCache(str(tmpdir), "TEST")
+        c.refresh_token = valid_refresh_token
+        c.access_token = valid_access_token
+
+        assert c.refresh_token == valid_refresh_token
+        assert c.access_token == valid_access_token
+
+    def test_snapshot_no_reads(self, tmpdir, valid_access_token,
+                               monkeypatch):
+        c = DiskCache(str(tmpdir), "TEST")
+        c.access_token = valid_access_token
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Cache file re-read")
+
+        monkeypatch.setattr("pyTD.cache.disk_cache.json.load", fail)
+        for i in range(3):
+            assert c.access_token.token == "validtoken"
+
+    def test_snapshot_sees_external_update(self, tmpdir,
+                                           valid_access_token):
+        c = DiskCache(str(tmpdir), "TEST")
+        c.access_token = valid_access_token
+        assert c.access_token.token == "validtoken"
+
+        other = DiskCache(str(tmpdir), "TEST")
+        new = AccessToken(token="newtoken", access_time=1,
+                          expires_in=10 ** 12)
+        other.access_token = new
+        assert c.access_token == new
+
+    def test_clear(self, tmpdir, valid_access_token):
+        c = DiskCache(str(tmpdir), "TEST")
+        c.access_token = valid_access_token
+        c.clear()
+
+        assert isinstance(c.access_token, EmptyToken)
+
+    def test_atomic_write(self, tmpdir, valid_access_token, monkeypatch):
+        c = DiskCache(str(tmpdir), "TEST")
+        c.access_token = valid_access_token
+
+        def fail(*args, **kwargs):
+            raise OSError("Disk full")
+
+        monkeypatch.setattr("pyTD.cache.disk_cache.replace", fail)
+        with pytest.raises(ConfigurationError):
+            c.access_token = AccessToken(token="newtoken", access_time=1,
+                                         expires_in=1)
+        monkeypatch.undo()
+
+        assert sorted(f.basename for f in tmpdir.listdir()) == [
+            "TEST", "TEST.lock"]
+        assert DiskCache(str(tmpdir), "TEST").access_token == \
+            valid_access_token
+
+
+class TestSQLCache(object):
+
+    def test_default_values(self, tmpdir):
+        c = SQLCache(str(tmpdir.join("tokens.db")), "TEST")
+
+        assert isinstance(c.refresh_token, EmptyToken)
+        assert isinstance(c.access_token, EmptyToken)
+
+    def test_keys_isolated(self, tmpdir, valid_refresh_token,
+                           valid_access_token):
+        path = str(tmpdir.join("tokens.db"))
+        c1 = SQLCache(path, "KEY1")
+        c2 = SQLCache(path, "KEY2")
+        c1.update(refresh_token=valid_refresh_token,
+                  access_token=valid_access_token)
+
+        assert c1.refresh_token == valid_refresh_token
+        assert c1.access_token == valid_access_token
+        assert isinstance(c2.access_token, EmptyToken)
+        assert c2.consumer_keys() == ["KEY1"]
+
+    def test_shared_between_connections(self, tmpdir, valid_access_token):
+        path = str(tmpdir.join("tokens.db"))
+        c = SQLCache(path, "KEY")
+        c.access_token = valid_access_token
+
+        result = []
+        t = threading.Thread(target=lambda: result.append(
+            SQLCache(path, "KEY").access_token))
+        t.start()
+        t.join()
+        assert result == [valid_access_token]
+
+    def test_clear(self, tmpdir, valid_refresh_token, valid_access_token):
+        c = SQLCache(str(tmpdir.join("tokens.db")), "KEY")
+        c.update(valid_refresh_token, valid_access_token)
+        c.access_token = EmptyToken()
+        assert isinstance(c.access_token, EmptyToken)
+        assert c.refresh_token == valid_refresh_token
+
+        c.clear()
+        assert c._get() == {}
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"),
+                    reason="Unix domain sockets not available")
+class TestBrokerCache(object):
+
+    @pytest.fixture(scope='function')
+    def broker(self, tmpdir, valid_api, monkeypatch):
+        refreshes = []
+
+        def request_access_token():
+            refreshes.append(1)
+            return AccessToken(token="newtoken", access_time=time.time(),
+                               expires_in=1800)
+        monkeypatch.setattr(valid_api.auth, "_request_access_token",
+                            request_access_token)
+        broker = TokenBroker(str(tmpdir.join("broker.sock")), valid_api)
+        broker.refreshes = refreshes
+        thread = threading.Thread(target=broker.serve_forever,
+                                  kwargs={"poll_interval": 0.05})
+        thread.start()
+        yield broker
+        broker.shutdown()
+        thread.join()
+        broker.server_close()
+
+    def test_tokens_served(self, broker):
+        c = BrokerCache(broker.path)
+
+        assert c.access_token.token == "validtoken"
+        assert c.refresh_token.valid is True
+        # The value of the refresh token is never sent
+        assert c.refresh_token.token == ""
+        with pytest.raises(ConfigurationError):
+            c.access_token = AccessToken(token="token", access_time=0,
+                                         expires_in=0)
+
+    def test_refresh_delegated(self, broker, valid_api, sample_oid,
+                               sample_uri):
+        workers = [api(consumer_key=sample_oid, callback_url=sample_uri,
+                       cache=BrokerCache(broker.path)) for _ in range(2)]
+        stale = [w.access_token for w in workers]
+
+        for w, token in zip(workers, stale):
+            assert w.auth.refresh_access_token(stale=token).token == \
+                "newtoken"
+        assert broker.refreshes == [1]
+        assert valid_api.access_token.token == "newtoken"
+
+    def test_broker_unavailable(self, tmpdir):
+        c = BrokerCache(str(tmpdir.join("none.sock")))
+
+        with pytest.raises(ConnectionError):
+            c.access_token
+
+
+class TestCandleStore(object):
+
+    @staticmethod
+    def candles(*times):
+        return [{"open": 1.0, "high": 2.0, "low": 0.5, "close": float(t),
+                 "volume": 100, "datetime": t} for t in times]
+
+    def test_missing(self, tmpdir):
+        store = CandleStore(str(tmpdir))
+        assert store.missing("AAPL", "minute-1-ext", 0, 100) == [(0, 100)]
+
+        store.update("AAPL", "minute-1-ext", [(20, 40, self.candles(20, 30))])
+        store.update("AAPL", "minute-1-ext", [(60, 70, self.candles(60))])
+
+        assert store.ranges("AAPL", "minute-1-ext") == [[20, 40], [60, 70]]
+        assert store.missing("AAPL", "minute-1-ext", 0, 100) == \
+            [(0, 19), (41, 59), (71, 100)]
+        assert store.missing("AAPL", "minute-1-ext", 25, 35) == []
+        assert store.missing("AAPL", "daily-1-ext", 25, 35) == [(25, 35)]
+
+    def test_update_dedupes(self, tmpdir):
+        store = CandleStore(str(tmpdir))
+        store.update("AAPL", "minute-1-ext", [(10, 30, self.candles(30, 10))])
+        new = self.candles(20, 30)
+        new[1]["close"] = 99.0
+        store.update("AAPL", "minute-1-ext", [(20, 40, new)])
+
+        out = store.read("AAPL", "minute-1-ext", 0, 100)
+        assert list(out["datetime"]) == [10, 20, 30]
+        assert list(out["close"]) == [10.0, 20.0, 99.0]
+        assert store.ranges("AAPL", "minute-1-ext") == [[10, 40]]
+        assert list(store.read("AAPL", "minute-1-ext", 15, 20)["datetime"]) \
+            == [20]
+
+    def test_update_writes_once(self, tmpdir, monkeypatch):
+        store = CandleStore(str(tmpdir))
+        writes = []
+        write = CandleStore._write
+
+        def counted(part, filename, data):
+            writes.append(filename)
+            write(part, filename, data)
+        monkeypatch.setattr(store, "_write", counted)
+        store.update("AAPL", "minute-1-ext", [(10, 19, self.candles(10)),
+                                              (20, 29, self.candles(20)),
+                                              (40, 49, self.candles(40))])
+
+        assert sorted(writes) == ["candles.npy", "ranges.json"]
+        assert store.ranges("AAPL", "minute-1-ext") == [[10, 29], [40, 49]]
+        assert list(store.read("AAPL", "minute-1-ext", 0, 100)["datetime"]) \
+            == [10, 20, 40]
+
+    def test_coverage_capped_at_midnight(self, tmpdir):
+        store = CandleStore(str(tmpdir))
+        now = int(time.time() * 1000)
+        store.update("/ES", "minute-1-ext",
+                     [(now - 10 ** 8, now, self.candles(now))])
+
+        end = store._midnight() - 1
+        assert store.ranges("/ES", "minute-1-ext") == [[now - 10 ** 8, end]]
+        assert len(store.read("/ES", "minute-1-ext", 0, now)) == 1
+
+        store.clear("/ES")
+        assert store.ranges("/ES", "minute-1-ext") == []
+
+    def test_midnight_exchange_time(self, tmpdir):
+        # 22:00 New York time on Jan 2, after midnight UTC
+        now = 1514948400000
+        store = CandleStore(str(tmpdir))
+
+        assert store._midnight(now) == 1514869200000
+        tokyo = CandleStore(str(tmpdir), tz="Asia/Tokyo")
+        assert tokyo._midnight(now) == 1514905200000
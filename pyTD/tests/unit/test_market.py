@@ -77,9 +77,13 @@ class TestQuotes(object):
             pyTD.market.get_quotes("BADSYMBOL")
 
     def test_quotes_bad_params(self):
-        bad = ["AAPL"] * 1000
         with pytest.raises(ValueError):
-            pyTD.market.get_quotes(bad)
+            pyTD.market.get_quotes("AAPL", batch_size=1000)
+
+    def test_quotes_batched(self):
+        data = pyTD.market.get_quotes(["AAPL", "TSLA", "MSFT"],
+                                      batch_size=2, output_format='json')
+        assert len(data) == 3
 
 
 @pytest.mark.webtest
@@ -0,0 +1,107 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import pytest
+
+from pyTD.market import Options
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
+from pyTD.utils.testing import MockResponse, MockSession
+
+ijson = pytest.importorskip("ijson")
+
+
+def contract(put_call, strike, **kwargs):
+    c = {"putCall": put_call, "symbol": "SPX_%s%s" % (put_call[0], strike),
+         "bid": 1.5, "ask": 1.75, "totalVolume": 10,
+         "optionDeliverablesList": [{"symbol": "SPX", "deliverableUnits": 1}]}
+    c.update(kwargs)
+    return c
+
+
+CHAIN = {
+    "symbol": "SPX",
+    "status": "SUCCESS",
+    "callExpDateMap": {
+        "2019-01-18:30": {
+            "2500.0": [contract("CALL", 2500)],
+            "2505.5": [contract("CALL", 2505.5, delta=0.5)]
+        }
+    },
+    "putExpDateMap": {
+        "2019-01-18:30": {
+            "2500.0": [contract("PUT", 2500)]
+        }
+    }
+}
+
+
+@pytest.fixture(scope='function')
+def chain_api(valid_api):
+    valid_api.session = MockSession({
+        "chains": MockResponse(json.dumps(CHAIN), 200)
+    })
+    return valid_api
+
+
+class TestOptionsStream(object):
+
+    def test_stream_columns(self, chain_api):
+        data = Options("SPX", api=chain_api, stream=True,
+                       output_format='json').execute()
+
+        assert data["putCall"] == ["CALL", "CALL", "PUT"]
+        assert data["strike"] == [2500.0, 2505.5, 2500.0]
+        assert data["expDate"] == ["2019-01-18:30"] * 3
+        assert data["bid"] == [1.5] * 3
+        # Fields missing from some contracts are filled with None
+        assert data["delta"] == [None, 0.5, None]
+        # Nested values are skipped
+        assert "optionDeliverablesList" not in data
+        _, _, kwargs = chain_api.session.requests[0]
+        assert kwargs["stream"] is True
+
+    def test_stream_frame(self, chain_api):
+        df = Options("SPX", api=chain_api, stream=True).execute()
+
+        assert len(df) == 3
+        assert list(df.columns[:3]) == ["expDate", "strike", "putCall"]
+        assert df["strike"].dtype == "float64"
+
+    def test_stream_failed(self, valid_api):
+        failed = {"symbol": "BAD", "status": "FAILED",
+                  "callExpDateMap": {}, "putExpDateMap": {}}
+        valid_api.session = MockSession({
+            "chains": MockResponse(json.dumps(failed), 200)
+        })
+
+        with pytest.raises(ResourceNotFound):
+            Options("BAD", api=valid_api, stream=True).execute()
+
+    def test_stream_error(self, valid_api):
+        valid_api.session = MockSession({
+            "chains": MockResponse('{"error": "Invalid symbol."}', 200)
+        })
+
+        with pytest.raises(TDQueryError) as e:
+            Options("BAD", api=valid_api, stream=True).execute()
+        assert e.value.content == "Invalid symbol."
@@ -0,0 +1,111 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import pytest
+
+from pyTD.api import api
+from pyTD.auth.tokens import AccessToken, RefreshToken
+from pyTD.cache import MemCache
+from pyTD.market import Quotes
+from pyTD.pool import ApiPool
+from pyTD.utils.retry import RetryPolicy
+from pyTD.tests.fixtures import valid_params
+from pyTD.utils.exceptions import ResourceNotFound, ServerError
+from pyTD.utils.testing import MockResponse, MockSession
+
+
+def quote_response(method, url, params=None, **kwargs):
+    data = {sym: {"symbol": sym} for sym in params["symbol"].split(",")}
+    return MockResponse(json.dumps(data), 200)
+
+
+def make_api(key, responses=None, **kwargs):
+    cache = MemCache()
+    cache.refresh_token = RefreshToken(valid_params)
+    cache.access_token = AccessToken(valid_params)
+    a = api(consumer_key="%s@AMER.OAUTHAP" % key,
+            callback_url="https://127.0.0.1:60000/td-callback",
+            cache=cache, retry_policy=RetryPolicy(total=0), **kwargs)
+    if responses is None:
+        responses = {"quotes": quote_response}
+    a.session = MockSession(responses)
+    return a
+
+
+class TestApiPool(object):
+
+    def test_requires_api(self):
+        with pytest.raises(ValueError):
+            ApiPool([])
+
+    def test_load_spread(self):
+        apis = [make_api("KEY%d" % i) for i in range(3)]
+        pool = ApiPool(apis)
+
+        symbols = ["SYM%d" % i for i in range(6)]
+        data = Quotes(symbols, api=pool, batch_size=1, max_workers=3,
+                      output_format='json').execute()
+
+        assert list(data) == symbols
+        assert all(stats["requests"] == 2 for stats in pool.stats)
+
+    def test_prefers_quota(self):
+        apis = [make_api("KEY0", rate_limit=1), make_api("KEY1",
+                                                         rate_limit=5)]
+        apis[0].rate_limiter.reserve(1)
+        pool = ApiPool(apis)
+
+        Quotes(["AAPL"], api=pool).execute()
+        assert len(apis[0].session.requests) == 0
+        assert len(apis[1].session.requests) == 1
+
+    def test_failover(self):
+        bad = make_api("BAD", {"quotes": MockResponse("Error", 503)})
+        good = make_api("GOOD")
+        pool = ApiPool([bad, good], max_failures=1)
+
+        for _ in range(3):
+            Quotes(["AAPL"], api=pool).execute()
+
+        # The failing credential is skipped after being marked unhealthy
+        assert len(bad.session.requests) == 1
+        assert len(good.session.requests) == 3
+        assert [s["healthy"] for s in pool.stats] == [False, True]
+
+    def test_all_fail(self):
+        apis = [make_api("KEY%d" % i, {"quotes": MockResponse("Error", 503)})
+                for i in range(2)]
+        pool = ApiPool(apis)
+
+        with pytest.raises(ServerError):
+            pool.request("GET", "https://none.com/quotes")
+        assert all(len(a.session.requests) == 1 for a in apis)
+
+    def test_client_error_not_failed_over(self):
+        apis = [make_api("KEY%d" % i, {}) for i in range(2)]
+        pool = ApiPool(apis)
+
+        with pytest.raises(ResourceNotFound):
+            pool.request("GET", "https://none.com/quotes")
+        assert sum(len(a.session.requests) for a in apis) == 1
+        assert all(s["healthy"] for s in pool.stats)
@@ -0,0 +1,228 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import pandas as pd
+import pytest
+
+from pyTD.cache import CandleStore
+from pyTD.market import PriceHistory
+from pyTD.market.price_history import _stitch_candles
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
+from pyTD.utils.testing import MockResponse, MockSession
+
+
+def candles(*times):
+    return json.dumps({"candles": [{"open": 1.0, "high": 2.0, "low": 0.5,
+                                    "close": 1.5, "volume": 100,
+                                    "datetime": t} for t in times],
+                       "empty": False})
+
+
+@pytest.fixture(scope='function')
+def history_api(valid_api):
+    valid_api.session = MockSession({
+        "/AAPL/": MockResponse(candles(1514872800000, 1514959200000), 200),
+        "/TSLA/": MockResponse(candles(1514872800000), 200),
+        "/BAD/": MockResponse('{"candles": [], "empty": true}', 200)
+    })
+    return valid_api
+
+
+class TestPriceHistoryExecute(object):
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_batch_pandas(self, history_api, max_workers):
+        data = PriceHistory(["AAPL", "TSLA"], api=history_api,
+                            max_workers=max_workers).execute()
+
+        assert isinstance(data.columns, pd.MultiIndex)
+        assert list(data.columns.levels[0]) == ["AAPL", "TSLA"]
+        assert len(data) == 2
+
+    def test_batch_partial_failure(self, history_api):
+        ph = PriceHistory(["AAPL", "BAD", "TSLA"], api=history_api,
+                          max_workers=3, output_format='json')
+        data = ph.execute()
+
+        assert list(data) == ["AAPL", "TSLA"]
+        assert list(ph.failures) == ["BAD"]
+        assert isinstance(ph.failures["BAD"], ResourceNotFound)
+
+    def test_batch_all_fail(self, history_api):
+        with pytest.raises(ResourceNotFound):
+            PriceHistory(["BAD", "NONE"], api=history_api,
+                         max_workers=2).execute()
+
+
+class TestCandleConversion(object):
+
+    def test_convert_output_one(self, history_api):
+        # Millisecond timestamps beyond float64 precision in nanoseconds
+        times = [1514872800001, 1514872860123]
+        ph = PriceHistory("AAPL", api=history_api)
+        df = ph._convert_output_one(json.loads(candles(*times))["candles"])
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert df.index.name == "datetime"
+        assert list(df.index.asi8) == [t * 10 ** 6 for t in times]
+        assert df["volume"].dtype == "int64"
+        assert df["close"].dtype == "float64"
+
+    def test_convert_output_one_missing_fields(self, history_api):
+        ph = PriceHistory("AAPL", api=history_api)
+        df = ph._convert_output_one([{"close": 1.5,
+                                      "datetime": 1514872800000}])
+
+        assert list(df.columns) == ["close"]
+        assert df.index[0] == pd.Timestamp("2018-01-02 06:00:00")
+
+
+def ranged_candles(method, url, params=None, **kwargs):
+    # One candle per hour of the requested range
+    hour = 3600 * 1000
+    start = -(-params["startDate"] // hour) * hour
+    times = range(start, params["endDate"] + 1, hour)
+    return MockResponse(candles(*times), 200)
+
+
+class TestCandleStore(object):
+
+    def test_gaps_only(self, valid_api, tmpdir):
+        valid_api.session = MockSession({"pricehistory": ranged_candles})
+        store = CandleStore(str(tmpdir))
+        kwargs = dict(api=valid_api, candle_store=store,
+                      frequency_type="minute", period_type="day")
+
+        first = PriceHistory("AAPL", start_date="2018-01-02",
+                             end_date="2018-01-03", **kwargs).execute()
+        df = PriceHistory("AAPL", start_date="2018-01-01",
+                          end_date="2018-01-04", **kwargs).execute()
+
+        requests = valid_api.session.requests
+        assert len(requests) == 3
+        ranges = [(kw["params"]["startDate"], kw["params"]["endDate"]) for
+                  _, _, kw in requests[1:]]
+        ph = PriceHistory("AAPL", start_date="2018-01-01",
+                          end_date="2018-01-04", **kwargs)
+        assert ranges[0][0] == ph.start
+        assert ranges[1][1] == ph.end
+        assert len(first) == 25
+        assert len(df) == 73
+        assert df.index.is_monotonic_increasing
+        assert df.index.is_unique
+
+        # Fully stored
+        data = PriceHistory("AAPL", start_date="2018-01-02",
+                            end_date="2018-01-03", output_format="json",
+                            **kwargs).execute()
+        assert len(valid_api.session.requests) == 3
+        assert len(data) == 25
+        assert data[0]["volume"] == 100
+
+    @pytest.mark.parametrize("extended,key", [
+        ("", "minute-1-ext"), (True, "minute-1-ext"), ("True", "minute-1-ext"),
+        ("true", "minute-1-ext"), (False, "minute-1-reg"),
+        ("False", "minute-1-reg"), ("false", "minute-1-reg")])
+    def test_store_key(self, valid_api, extended, key):
+        ph = PriceHistory("AAPL", api=valid_api, frequency_type="minute",
+                          extended=extended)
+
+        assert ph._store_key == key
+
+    def test_malformed_candles(self, valid_api, tmpdir):
+        def respond(method, url, params=None, **kwargs):
+            if "/BAD/" in url:
+                return MockResponse('{"candles": [{"close": 1.5, '
+                                    '"datetime": 1514872800000}]}', 200)
+            return ranged_candles(method, url, params=params, **kwargs)
+        valid_api.session = MockSession({"pricehistory": respond})
+        ph = PriceHistory(["AAPL", "BAD"], api=valid_api,
+                          candle_store=CandleStore(str(tmpdir)),
+                          frequency_type="minute", start_date="2018-01-02",
+                          end_date="2018-01-03")
+        df = ph.execute()
+
+        assert list(df.columns.levels[0]) == ["AAPL"]
+        assert list(ph.failures) == ["BAD"]
+        assert isinstance(ph.failures["BAD"], TDQueryError)
+
+
+class TestRangeSplitting(object):
+
+    def test_plan(self, valid_api):
+        day = 24 * 3600 * 1000
+        ph = PriceHistory("AAPL", api=valid_api, frequency_type="minute")
+
+        assert ph._plan(0, 25 * day - 1) == [(0, 10 * day - 1),
+                                             (10 * day, 20 * day - 1),
+                                             (20 * day, 25 * day - 1)]
+        assert ph._plan(0, 5 * day) == [(0, 5 * day)]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_split_and_stitched(self, valid_api, max_workers):
+        valid_api.session = MockSession({"pricehistory": ranged_candles})
+        ph = PriceHistory(["AAPL", "TSLA"], api=valid_api,
+                          frequency_type="minute", period_type="day",
+                          start_date="2018-01-01", end_date="2018-01-31",
+                          max_workers=max_workers)
+        df = ph.execute()
+
+        requests = valid_api.session.requests
+        assert len(requests) == 8
+        assert len(df) == 30 * 24 + 1
+        assert df.index.is_monotonic_increasing
+        assert df.index.is_unique
+        assert df.index.asi8.dtype == "int64"
+
+    def test_period_not_split(self, valid_api):
+        valid_api.session = MockSession({"pricehistory": ranged_candles})
+        ph = PriceHistory("AAPL", api=valid_api, period_type="day", period=5,
+                          frequency_type="minute")
+        ph.execute()
+
+        assert len(valid_api.session.requests) == 1
+        params = valid_api.session.requests[0][2]["params"]
+        assert params["period"] == 5
+        assert params["startDate"] == ph.start
+        assert params["endDate"] == ph.end
+
+    def test_stitch_candles(self):
+        chunks = [json.loads(candles(3, 1, 2))["candles"],
+                  json.loads(candles(2, 4))["candles"]]
+        out = _stitch_candles(chunks)
+
+        assert list(out["datetime"]) == [1, 2, 3, 4]
+
+    def test_empty_chunks(self, valid_api):
+        def respond(method, url, params=None, **kwargs):
+            if params["startDate"] == ph.start:
+                return MockResponse('{"candles": [], "empty": true}', 200)
+            return ranged_candles(method, url, params=params, **kwargs)
+        valid_api.session = MockSession({"pricehistory": respond})
+        ph = PriceHistory("AAPL", api=valid_api, frequency_type="minute",
+                          start_date="2018-01-01", end_date="2018-01-15",
+                          output_format="json")
+        data = ph.execute()
+
+        assert len(data) == 4 * 24 + 1
+        assert data[0]["volume"] == 100
@@ -0,0 +1,140 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import numpy as np
+import pytest
+
+from pyTD.market import Quotes
+from pyTD.utils.exceptions import ResourceNotFound
+from pyTD.utils.testing import MockResponse, MockSession
+
+
+def quote_response(method, url, params=None, **kwargs):
+    symbols = params["symbol"].split(",")
+    data = {sym: {"symbol": sym, "lastPrice": 100.0, "bidSize": 200}
+            for sym in symbols if not sym.startswith("BAD")}
+    return MockResponse(json.dumps(data), 200)
+
+
+@pytest.fixture(scope='function')
+def quotes_api(valid_api):
+    valid_api.session = MockSession({"quotes": quote_response})
+    return valid_api
+
+
+class TestQuotesBatching(object):
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_batches_merged(self, quotes_api, max_workers):
+        symbols = ["SYM%d" % i for i in range(250)]
+        data = Quotes(symbols, api=quotes_api, max_workers=max_workers,
+                      output_format='json').execute()
+
+        assert list(data) == symbols
+        requests = quotes_api.session.requests
+        assert len(requests) == 3
+        assert sorted(len(kwargs["params"]["symbol"].split(","))
+                      for _, _, kwargs in requests) == [50, 100, 100]
+
+    def test_batch_failure(self, quotes_api):
+        symbols = ["AAPL", "TSLA", "BAD1", "BAD2"]
+        q = Quotes(symbols, api=quotes_api, batch_size=2)
+        data = q.execute()
+
+        assert list(data.columns) == ["AAPL", "TSLA"]
+        assert list(q.failures) == [("BAD1", "BAD2")]
+        assert isinstance(q.failures[("BAD1", "BAD2")], ResourceNotFound)
+
+    def test_all_batches_fail(self, quotes_api):
+        with pytest.raises(ResourceNotFound):
+            Quotes("BAD", api=quotes_api).execute()
+
+    def test_bad_batch_size(self, quotes_api):
+        with pytest.raises(ValueError):
+            Quotes("AAPL", api=quotes_api, batch_size=101)
+
+
+class TestQuotesNumpy(object):
+
+    def test_structured_array(self, quotes_api):
+        q = Quotes(["aapl", "BAD1", "TSLA"], api=quotes_api, batch_size=1,
+                   output_format='numpy')
+        out = q.execute()
+
+        assert out.dtype == Quotes._NUMPY_DTYPE
+        assert list(out["symbol"]) == [0, -1, 2]
+        assert q.symbol_codes == {"AAPL": 0, "BAD1": 1, "TSLA": 2}
+        assert out["lastPrice"][0] == 100.0
+        assert np.isnan(out["lastPrice"][1])
+        assert list(out["bidSize"]) == [200, 0, 200]
+        assert out["askSize"].dtype == np.int64
+
+    def test_buffer_reused(self, quotes_api):
+        q = Quotes(["AAPL", "TSLA"], api=quotes_api, output_format='numpy')
+        first = q.execute()
+        second = q.execute()
+
+        assert second is first
+
+    def test_unsupported(self, valid_api):
+        from pyTD.market import Movers
+        movers = Movers("$DJI", api=valid_api, output_format='numpy')
+        with pytest.raises(ValueError):
+            movers._output_format([])
+
+
+class TestQuotesFields(object):
+
+    def test_json(self, quotes_api):
+        data = Quotes(["AAPL", "TSLA"], api=quotes_api, output_format='json',
+                      fields=["lastPrice", "askPrice"]).execute()
+
+        assert data == {"AAPL": {"symbol": "AAPL", "lastPrice": 100.0},
+                        "TSLA": {"symbol": "TSLA", "lastPrice": 100.0}}
+
+    def test_pandas(self, quotes_api):
+        df = Quotes(["AAPL", "TSLA"], api=quotes_api,
+                    fields=["lastPrice", "bidSize"]).execute()
+
+        assert list(df.index) == ["symbol", "lastPrice", "bidSize"]
+        assert list(df.columns) == ["AAPL", "TSLA"]
+
+    def test_numpy(self, quotes_api):
+        out = Quotes("AAPL", api=quotes_api, output_format='numpy',
+                     fields=["symbol", "bidSize", "lastPrice"]).execute()
+
+        assert out.dtype.names == ("symbol", "bidSize", "lastPrice")
+        assert out["bidSize"][0] == 200
+
+    def test_arrow(self, quotes_api):
+        pytest.importorskip("pyarrow")
+        table = Quotes(["AAPL", "TSLA"], api=quotes_api,
+                       output_format='arrow',
+                       fields=["lastPrice", "bidSize"]).execute()
+
+        assert table.schema.names == ["symbol", "lastPrice", "bidSize"]
+        assert table.column("symbol").to_pylist() == ["AAPL", "TSLA"]
+
+    def test_no_fields(self, quotes_api):
+        with pytest.raises(ValueError):
+            Quotes("AAPL", api=quotes_api, fields=[])
@@ -0,0 +1,114 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyTD.market import PriceHistory, get_history_intraday, resample
+from pyTD.tests.unit.test_price_history import ranged_candles
+from pyTD.utils.testing import MockSession
+
+
+def minute_frame(start, count, seed=0):
+    rng = np.random.RandomState(seed)
+    close = 100 + rng.randn(count).cumsum()
+    spread = rng.rand(count)
+    index = pd.date_range(start, periods=count, freq="min", name="datetime")
+    return pd.DataFrame({"open": close - spread / 2, "high": close + spread,
+                         "low": close - spread, "close": close,
+                         "volume": rng.randint(1, 1000, count)},
+                        index=index)
+
+
+class TestResample(object):
+
+    @pytest.mark.parametrize("interval,freq", [("5m", "5min"),
+                                               ("15min", "15min"),
+                                               ("1h", "1h")])
+    def test_matches_pandas(self, interval, freq):
+        df = minute_frame("2018-01-02 14:30", 500)
+        bars = resample(df, interval, tz=None)
+
+        expected = df.resample(freq).agg({
+            "open": "first", "high": "max", "low": "min", "close": "last",
+            "volume": "sum"}).dropna()
+        np.testing.assert_allclose(bars.values, expected.values)
+        assert list(bars.index) == list(expected.index)
+        assert bars["volume"].dtype == np.int64
+
+    def test_symbols(self):
+        aapl = minute_frame("2018-01-02 14:30", 30)
+        tsla = minute_frame("2018-01-02 14:40", 30, seed=1)
+        df = pd.concat([aapl, tsla], keys=["AAPL", "TSLA"], axis=1)
+        bars = resample(df, "15m")
+
+        assert list(bars.columns.levels[0]) == ["AAPL", "TSLA"]
+        expected = resample(tsla, "15m")
+        np.testing.assert_allclose(bars["TSLA"].dropna().values,
+                                   expected.values)
+        assert list(bars["TSLA"].dropna().index) == list(expected.index)
+        assert bars["AAPL"]["high"].iloc[0] == aapl["high"].iloc[:15].max()
+
+    def test_daily_session(self):
+        # 19:00 and 21:00 New York time on Jan 2, after midnight UTC
+        df = minute_frame("2018-01-03 00:00", 121)
+        bars = resample(df, "1d")
+
+        assert len(bars) == 1
+        assert bars.index[0] == pd.Timestamp("2018-01-02 05:00")
+        assert bars["volume"].iloc[0] == df["volume"].sum()
+        assert len(resample(df, "1d", tz=None)) == 1
+        assert len(resample(df, "1d", tz="Asia/Tokyo")) == 1
+
+    def test_offset(self):
+        df = minute_frame("2018-01-02 14:30", 120)
+        bars = resample(df, "1h", offset="30m")
+
+        assert list(bars.index) == [pd.Timestamp("2018-01-02 14:30"),
+                                    pd.Timestamp("2018-01-02 15:30")]
+
+    def test_intervals(self):
+        df = minute_frame("2018-01-02 14:30", 60)
+        bars = resample(df, ["5m", "1h"])
+
+        assert list(bars) == ["5m", "1h"]
+        assert len(bars["5m"]) == 12
+
+    @pytest.mark.parametrize("interval", ["5s", "0m", "2d", "fast"])
+    def test_bad_interval(self, interval):
+        with pytest.raises(ValueError):
+            resample(minute_frame("2018-01-02", 5), interval)
+
+
+def test_get_history_intraday(valid_api):
+    valid_api.session = MockSession({"pricehistory": ranged_candles})
+    bars = get_history_intraday(["AAPL", "TSLA"], "2018-01-02", "2018-01-03",
+                                interval=["1h", "1d"], api=valid_api)
+
+    ph = PriceHistory("AAPL", start_date="2018-01-02",
+                      end_date="2018-01-03", api=valid_api)
+    params = valid_api.session.requests[0][2]["params"]
+    assert params["frequencyType"] == "minute"
+    assert params["startDate"] == ph.start
+    assert len(bars["1h"]) == 25
+    assert bars["1d"]["AAPL"]["volume"].sum() == 2500
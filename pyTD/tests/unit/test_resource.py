@@ -24,9 +24,12 @@ import pytest
 
 
 from pyTD.api import api
-from pyTD.resource import Get
-from pyTD.utils.exceptions import TDQueryError
-from pyTD.utils.testing import MockResponse
+from pyTD.cache import ResponseCache
+from pyTD.instruments import Instruments
+from pyTD.resource import Get, RawResponse
+from pyTD.utils.exceptions import ResourceNotFound, TDQueryError
+from pyTD.market import MarketHours, PriceHistory, Quotes
+from pyTD.utils.testing import MockResponse, MockSession
 
 
 @pytest.fixture(params=[
@@ -50,3 +53,94 @@ class TestResource(object):
 
         with pytest.raises(TDQueryError):
             resource.get()
+
+    def test_get_response_cache(self, valid_api):
+        valid_api.response_cache = ResponseCache()
+        valid_api.session = MockSession({
+            "hours": MockResponse('{"equity": {}}', 200)
+        })
+        resource = MarketHours(api=valid_api)
+
+        assert resource.get() == {"equity": {}}
+        assert resource.get() == {"equity": {}}
+        assert len(valid_api.session.requests) == 1
+        assert valid_api.response_cache.stats["hits"] == 1
+
+    def test_get_response_cache_copies(self, valid_api):
+        valid_api.response_cache = ResponseCache()
+        valid_api.session = MockSession({
+            "hours": MockResponse('{"equity": {"EQ": [1, 2]}}', 200)
+        })
+        resource = MarketHours(api=valid_api, output_format='json')
+
+        first = resource.execute()
+        first["equity"]["EQ"].append(3)
+        first["option"] = {}
+        second = resource.execute()
+        second["equity"]["EQ"].pop()
+
+        assert resource.execute() == {"equity": {"EQ": [1, 2]}}
+        assert valid_api.response_cache.stats["hits"] == 2
+
+    def test_get_not_cached(self, valid_api):
+        valid_api.response_cache = ResponseCache()
+        valid_api.session = MockSession({"/": MockResponse("{}", 200)})
+        resource = Get(api=valid_api)
+
+        resource.get()
+        resource.get()
+        assert len(valid_api.session.requests) == 2
+
+
+class TestRawOutput(object):
+
+    def test_raw(self, valid_api):
+        body = '{"AAPL": {"lastPrice": 1.5}}'
+        valid_api.session = MockSession({"quotes": MockResponse(body, 200)})
+        data = Quotes("AAPL", api=valid_api, output_format='raw').execute()
+
+        assert len(data) == 1
+        assert isinstance(data[0], RawResponse)
+        assert isinstance(data[0].data, memoryview)
+        assert data[0].tobytes() == body.encode("utf-8")
+        assert data[0].status_code == 200
+        assert data[0].json() == {"AAPL": {"lastPrice": 1.5}}
+
+    def test_raw_not_cached(self, valid_api):
+        valid_api.response_cache = ResponseCache()
+        valid_api.session = MockSession({
+            "hours": MockResponse('{"equity": {}}', 200)
+        })
+        resource = MarketHours(api=valid_api, output_format='raw')
+
+        assert resource.execute().tobytes() == b'{"equity": {}}'
+        assert len(valid_api.response_cache) == 0
+
+    def test_raw_error(self, valid_api):
+        valid_api.session = MockSession({
+            "instruments": MockResponse('{"error": "Not Found."}', 200)
+        })
+
+        with pytest.raises(TDQueryError):
+            Instruments("AAPL", api=valid_api, output_format='raw').execute()
+
+    def test_raw_empty(self, valid_api):
+        valid_api.session = MockSession({
+            "instruments": MockResponse("{}", 200),
+            "pricehistory": MockResponse('{"candles": [], "empty": true}',
+                                         200)
+        })
+
+        with pytest.raises(ResourceNotFound):
+            Instruments("AAPL", api=valid_api, output_format='raw').execute()
+        with pytest.raises(ResourceNotFound):
+            PriceHistory("AAPL", api=valid_api,
+                         output_format='raw').execute()
+
+    def test_raw_large_not_inspected(self):
+        body = b'{"description": "' + b'"error"' * 1000 + b'"}'
+        raw = RawResponse(memoryview(body))
+
+        assert not raw.small
+        assert not raw.contains(b'"error"')
+        assert raw
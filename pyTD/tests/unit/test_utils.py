@@ -24,7 +24,9 @@ import datetime
 import pytest
 import pandas as pd
 
-from pyTD.utils import _handle_lists, _sanitize_dates
+from pyTD.utils import _handle_lists, _sanitize_dates, _map_concurrent
+from pyTD.utils.decoders import DECODERS, get_decoder
+from pyTD.utils.rate_limit import RateLimiter
 
 
 @pytest.fixture(params=[
@@ -91,3 +93,77 @@ class TestUtils(object):
 
         with pytest.raises(ValueError):
             _sanitize_dates(start, end)
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_map_concurrent(self, max_workers):
+        def func(item):
+            if item == 2:
+                raise ValueError("bad item")
+            return item * 10
+
+        results, failures = _map_concurrent(func, [1, 2, 3],
+                                            max_workers=max_workers)
+
+        assert results == {1: 10, 3: 30}
+        assert list(failures) == [2]
+        assert isinstance(failures[2], ValueError)
+
+
+class TestRateLimiter(object):
+
+    def test_burst_then_wait(self):
+        limiter = RateLimiter(rate=10, period=1, burst=2)
+
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+
+    def test_refill(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("pyTD.utils.rate_limit.monotonic",
+                            lambda: now[0])
+        limiter = RateLimiter(rate=2, period=1)
+        limiter.reserve(2)
+        assert limiter.available == 0
+
+        now[0] += 0.5
+        assert limiter.available == pytest.approx(1)
+
+        now[0] += 10
+        assert limiter.available == 2
+
+    def test_shared_between_instances(self, tmpdir):
+        path = str(tmpdir.join("key.ratelimit"))
+        first = RateLimiter(rate=2, period=60, path=path)
+        second = RateLimiter(rate=2, period=60, path=path)
+
+        assert first.reserve() == 0
+        assert second.reserve() == 0
+        assert first.reserve() > 0
+
+
+class TestDecoders(object):
+
+    @pytest.mark.parametrize("name", sorted(DECODERS))
+    def test_decode(self, name):
+        decoder = get_decoder(name)
+
+        assert decoder(b'{"AAPL": {"lastPrice": 1.5}}') == \
+            {"AAPL": {"lastPrice": 1.5}}
+        assert decoder(u'[1, "\u00e9"]') == [1, u"\u00e9"]
+        with pytest.raises(ValueError):
+            decoder(b'{"AAPL":')
+
+    def test_default_decoder(self):
+        assert get_decoder() in DECODERS.values()
+        if "orjson" in DECODERS:
+            assert get_decoder() is DECODERS["orjson"]
+
+    def test_custom_decoder(self):
+        def decoder(data):
+            return data
+        assert get_decoder(decoder) is decoder
+
+    def test_unavailable_decoder(self):
+        with pytest.raises(ValueError):
+            get_decoder("simdjson")
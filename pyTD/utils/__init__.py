@@ -25,11 +25,11 @@ import requests
 import datetime as dt
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 from pandas import to_datetime
-import pandas.compat as compat
-
-from pyTD.compat import is_number
+from pyTD.compat import is_number, string_types
 
 
 logger = logging.getLogger(__name__)
@@ -57,7 +57,7 @@ def gprint(msg):
 
 
 def _handle_lists(l, mult=True, err_msg=None):
-    if isinstance(l, (compat.string_types, int)):
+    if isinstance(l, string_types + (int,)):
         return [l] if mult is True else l
     elif isinstance(l, pd.DataFrame) and mult is True:
         return list(l.index)
@@ -67,6 +67,52 @@ def _handle_lists(l, mult=True, err_msg=None):
         raise ValueError(err_msg or "Only 1 symbol/market parameter allowed.")
 
 
+def _map_concurrent(func, items, max_workers=1, catch=Exception):
+    """
+    Applies func to each item, optionally across a pool of threads
+
+    Parameters
+    ----------
+    func: callable
+        Function of a single item
+    items: list-like
+        Items to apply func to
+    max_workers: int, default 1, optional
+        Number of worker threads. Items are processed sequentially in the
+        calling thread if 1 or less
+    catch: Exception or tuple, default Exception, optional
+        Exceptions to collect as per-item failures rather than raise
+
+    Returns
+    -------
+    results: dict
+        Results of successful calls keyed by item, in input order
+    failures: dict
+        Exceptions raised by failed calls keyed by item, in input order
+    """
+    results = {}
+    failures = {}
+
+    def call(item):
+        try:
+            return True, func(item)
+        except catch as e:
+            return False, e
+
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        outcomes = [call(item) for item in items]
+    else:
+        workers = min(max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(call, items))
+    for item, (ok, value) in zip(items, outcomes):
+        if ok:
+            results[item] = value
+        else:
+            failures[item] = value
+    return results, failures
+
+
 def _init_session(session):
     if session is None:
         session = requests.session()
@@ -0,0 +1,113 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The arrow output format requires pyarrow.")
+    return pa
+
+
+def _arrow_type(name):
+    if name.startswith("timestamp"):
+        # e.g. timestamp[ms]
+        return pa.timestamp(name[10:-1])
+    return {"string": pa.string(), "float64": pa.float64(),
+            "int64": pa.int64(), "bool": pa.bool_()}[name]
+
+
+def arrow_schema(fields):
+    """
+    Builds a pyarrow schema
+
+    Parameters
+    ----------
+    fields: tuple
+        (name, type) pairs, where type is string, float64, int64, bool, or
+        timestamp[unit]
+    """
+    _require_pyarrow()
+    return pa.schema([(name, _arrow_type(t)) for name, t in fields])
+
+
+def table_from_columns(columns, fields, length):
+    """
+    Builds a pyarrow Table with the given fields from columns of values.
+    Fields without a column are null
+
+    Parameters
+    ----------
+    columns: dict
+        Sequences (lists or numpy arrays) of values keyed by field name
+    fields: tuple
+        (name, type) pairs of the table schema (see arrow_schema)
+    length: int
+        Number of rows
+    """
+    schema = arrow_schema(fields)
+    arrays = []
+    for field in schema:
+        values = columns.get(field.name)
+        if values is None:
+            arrays.append(pa.nulls(length, type=field.type))
+        else:
+            arrays.append(_to_array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _to_array(values, arrow_type):
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if arrow_type != pa.float64():
+            raise
+        # Numbers sent as strings (e.g. "NaN")
+        return pa.array([None if v is None else float(v) for v in values],
+                        type=arrow_type)
+
+
+def concat_tables(tables):
+    """
+    Concatenates pyarrow Tables with the same schema
+    """
+    return _require_pyarrow().concat_tables(tables)
+
+
+def table_from_rows(rows, fields):
+    """
+    Builds a pyarrow Table with the given fields from rows of values. Keys
+    of the rows which are not fields are ignored
+
+    Parameters
+    ----------
+    rows: list
+        Dictionaries of values keyed by field name
+    fields: tuple
+        (name, type) pairs of the table schema (see arrow_schema)
+    """
+    columns = {name: [row.get(name) for row in rows] for name, _ in fields}
+    return table_from_columns(columns, fields, len(rows))
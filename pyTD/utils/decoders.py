@@ -0,0 +1,93 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+from pyTD.compat import string_types
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _json_loads(data):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def _ujson_loads(data):
+    # ujson only accepts str and bytes
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    return ujson.loads(data)
+
+
+DECODERS = {"json": _json_loads}
+if ujson is not None:
+    DECODERS["ujson"] = _ujson_loads
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+# In order of preference
+_PREFERENCE = ("orjson", "ujson", "json")
+
+
+def get_decoder(decoder=None):
+    """
+    Returns a JSON decoder: a function of str or bytes (decoded as UTF-8)
+    which returns the decoded object and raises ValueError on malformed
+    input
+
+    Parameters
+    ----------
+    decoder: str or callable, optional
+        Name of the decoder ("orjson", "ujson", or "json") or a decoding
+        function. Defaults to the fastest installed decoder
+
+    Raises
+    ------
+    ValueError
+        If the named decoder is not installed
+    """
+    if decoder is None:
+        return next(DECODERS[name] for name in _PREFERENCE
+                    if name in DECODERS)
+    if isinstance(decoder, string_types):
+        try:
+            return DECODERS[decoder]
+        except KeyError:
+            raise ValueError("JSON decoder %s is not available. Available "
+                             "decoders: %s" % (decoder,
+                                               ", ".join(sorted(DECODERS))))
+    if not callable(decoder):
+        raise ValueError("Please input a valid JSON decoder.")
+    return decoder
+
+
+loads = get_decoder()
@@ -0,0 +1,154 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import logging
+import threading
+import time
+
+from pyTD.compat import monotonic
+from pyTD.utils.lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(object):
+    """
+    Token-bucket rate limiter. Tokens are replenished continuously at
+    ``rate`` per ``period`` seconds up to ``burst``; each request consumes
+    one token and waits for it if the bucket is empty.
+
+    Parameters
+    ----------
+    rate: int, default 120, optional
+        Number of requests allowed per period
+    period: float, default 60, optional
+        Length of the period in seconds
+    burst: int, optional
+        Maximum number of requests which may be made at once. Defaults to
+        rate
+    path: str, optional
+        Path of a file in which to share the bucket between processes. The
+        bucket is shared between threads only if not passed.
+
+    Usage
+    -----
+
+        >>> limiter = RateLimiter(rate=120, period=60)
+        >>> limiter.acquire()
+    """
+    def __init__(self, rate=120, period=60.0, burst=None, path=None):
+        if rate <= 0 or period <= 0:
+            raise ValueError("rate and period must be positive.")
+        self.rate = rate
+        self.period = float(period)
+        self.burst = burst or rate
+        self.path = path
+        self._lock = threading.Lock()
+        self._file_lock = FileLock("%s.lock" % path) if path else None
+        self._tokens = float(self.burst)
+        self._updated = self._clock()
+
+    def __repr__(self):
+        fmt = "RateLimiter(rate= %s, period = %s, burst = %s, path = %s)"
+        return fmt % (self.rate, self.period, self.burst, self.path)
+
+    @property
+    def fill_rate(self):
+        """Tokens replenished per second"""
+        return self.rate / self.period
+
+    def _clock(self):
+        # Wall-clock time is needed to compare timestamps across processes
+        return time.time() if self.path else monotonic()
+
+    def _refill(self, tokens, updated, now):
+        elapsed = max(now - updated, 0)
+        return min(self.burst, tokens + elapsed * self.fill_rate)
+
+    def _read_state(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            return state["tokens"], state["updated"]
+        except (IOError, OSError, ValueError, KeyError):
+            return float(self.burst), self._clock()
+
+    def _write_state(self, tokens, updated):
+        with open(self.path, "w") as f:
+            json.dump({"tokens": tokens, "updated": updated}, f)
+
+    def _take(self, tokens, updated, count):
+        now = self._clock()
+        tokens = self._refill(tokens, updated, now) - count
+        wait = -tokens / self.fill_rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def reserve(self, count=1):
+        """
+        Reserves tokens without waiting for them
+
+        Parameters
+        ----------
+        count: int, default 1, optional
+            Number of tokens to reserve
+
+        Returns
+        -------
+        wait: float
+            Seconds to wait before the reserved tokens may be used
+        """
+        with self._lock:
+            if self._file_lock is None:
+                self._tokens, self._updated, wait = self._take(
+                    self._tokens, self._updated, count)
+                return wait
+            with self._file_lock:
+                tokens, updated = self._read_state()
+                tokens, updated, wait = self._take(tokens, updated, count)
+                self._write_state(tokens, updated)
+                return wait
+
+    def acquire(self, count=1):
+        """
+        Waits until tokens are available and consumes them
+
+        Parameters
+        ----------
+        count: int, default 1, optional
+            Number of tokens to acquire
+        """
+        wait = self.reserve(count)
+        if wait > 0:
+            logger.debug("Rate limit reached. Waiting %.3f seconds." % wait)
+            time.sleep(wait)
+
+    @property
+    def available(self):
+        """Number of tokens currently available"""
+        with self._lock:
+            if self._file_lock is None:
+                tokens, updated = self._tokens, self._updated
+            else:
+                with self._file_lock:
+                    tokens, updated = self._read_state()
+            return self._refill(tokens, updated, self._clock())
@@ -0,0 +1,146 @@
+# MIT License
+
+# Copyright (c) 2018 Addison Lynch
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import calendar
+import logging
+import random
+import time
+
+from email.utils import parsedate_tz
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy(object):
+    """
+    Retry policy for failed requests. Only transient failures (connection
+    errors, timeouts, and the statuses in ``statuses``) are retried, with
+    exponential backoff between attempts.
+
+    Parameters
+    ----------
+    total: int, default 3, optional
+        Maximum number of retries after the first attempt
+    backoff_factor: float, default 0.5, optional
+        Base backoff in seconds. The n-th retry waits up to
+        ``backoff_factor * 2 ** (n - 1)`` seconds
+    max_backoff: float, default 30, optional
+        Maximum backoff in seconds
+    jitter: bool, default True, optional
+        Randomize each backoff uniformly between 0 and its maximum ("full
+        jitter") to spread out retries of concurrent clients
+    statuses: iterable, optional
+        HTTP status codes to retry. Defaults to 429 and all 5xx statuses
+    respect_retry_after: bool, default True, optional
+        Wait for the duration given by a Retry-After response header
+        (at most max_backoff) instead of the computed backoff, if present
+
+    Usage
+    -----
+
+        >>> policy = RetryPolicy(total=5, backoff_factor=0.25)
+        >>> api(consumer_key=..., callback_url=..., retry_policy=policy)
+    """
+    DEFAULT_STATUSES = frozenset([429] + list(range(500, 600)))
+
+    def __init__(self, total=3, backoff_factor=0.5, max_backoff=30.0,
+                 jitter=True, statuses=None, respect_retry_after=True):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses or self.DEFAULT_STATUSES)
+        self.respect_retry_after = respect_retry_after
+
+    def __repr__(self):
+        fmt = ("RetryPolicy(total= %s, backoff_factor = %s, max_backoff = %s, "
+               "jitter = %s)")
+        return fmt % (self.total, self.backoff_factor, self.max_backoff,
+                      self.jitter)
+
+    def is_retryable(self, response=None, error=None):
+        """
+        Whether a failed attempt is transient
+
+        Parameters
+        ----------
+        response: requests.Response, optional
+            Response of the attempt
+        error: Exception, optional
+            Connection error or timeout raised by the attempt
+        """
+        if error is not None:
+            return True
+        return response is not None and response.status_code in self.statuses
+
+    def should_retry(self, retries, response=None, error=None):
+        """
+        Whether to retry a failed attempt
+
+        Parameters
+        ----------
+        retries: int
+            Number of retries already made
+        response: requests.Response, optional
+            Response of the attempt
+        error: Exception, optional
+            Connection error or timeout raised by the attempt
+        """
+        return retries < self.total and self.is_retryable(response, error)
+
+    def backoff(self, retries, response=None):
+        """
+        Seconds to wait before the next retry
+
+        Parameters
+        ----------
+        retries: int
+            Number of retries already made
+        response: requests.Response, optional
+            Response of the failed attempt
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = self._parse_retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** retries)
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def _parse_retry_after(response):
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+        # Fall back to UTC when the date has no time zone offset
+        offset = date[9] or 0
+        seconds = calendar.timegm(date[:9]) - offset
+        return max(seconds - time.time(), 0.0)
@@ -72,9 +72,21 @@ class MockResponse(object):
         self.request_params = request_params
         self.request_headers = request_headers
 
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    @property
+    def raw(self):
+        import io
+        return io.BytesIO(self.content)
+
     def json(self):
-        import json
-        return json.loads(self.text)
+        from pyTD.utils.decoders import loads
+        return loads(self.content)
+
+    def close(self):
+        pass
 
     def raise_for_status(self):
         # Pulled directly from requests source code
@@ -92,6 +104,35 @@ class MockResponse(object):
             raise HTTPError(http_error_msg, response=self)
 
 
+class MockSession(object):
+    """
+    Class for mocking requests sessions. Responds with the response
+    registered to the first URL fragment found in the request URL.
+    """
+
+    def __init__(self, responses=None):
+        """
+        Initialize the class
+
+        Parameters
+        ----------
+        responses: dict, optional
+                MockResponse objects (or callables of the request arguments
+                returning them) keyed by URL fragment
+        """
+        self.responses = responses or {}
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        for fragment, response in self.responses.items():
+            if fragment in url:
+                if callable(response):
+                    return response(method, url, **kwargs)
+                return response
+        return MockResponse('{"error": "Not Found."}', 404, request_url=url)
+
+
 MOCK_SSL_CERT = """\
 -----BEGIN CERTIFICATE-----
 MIIDtTCCAp2gAwIBAgIJAPuEP7NccyjCMA0GCSqGSIb3DQEBBQUAMEUxCzAJBgNV
@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+
+"""
+Benchmark of candle conversion in PriceHistory: the columnar conversion
+(pyTD.market.price_history._candles_to_arrays) against building a DataFrame
+from the list of candle dictionaries
+
+Usage: python scripts/bench_candles.py [--candles N] [--repeat N]
+"""
+import argparse
+import timeit
+
+import pandas as pd
+
+from pyTD.market.price_history import _arrays_to_frame, _candles_to_arrays
+
+
+def make_candles(count):
+    return [{"open": 150.0 + i % 7, "high": 151.25, "low": 149.5,
+             "close": 150.75, "volume": 1000 + i,
+             "datetime": 1514872800000 + 60000 * i} for i in range(count)]
+
+
+def rows(candles):
+    df = pd.DataFrame(candles)
+    df = df.set_index(pd.DatetimeIndex(df["datetime"]/1000*10**9))
+    return df.drop("datetime", axis=1)
+
+
+def columnar(candles):
+    return _arrays_to_frame(*_candles_to_arrays(candles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candles", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    candles = make_candles(args.candles)
+    print("%d candles" % args.candles)
+    baseline = None
+    for name, func in (("rows", rows), ("columnar", columnar)):
+        best = min(timeit.repeat(lambda: func(candles), number=1,
+                                 repeat=args.repeat))
+        baseline = baseline or best
+        print("  %-9s %8.1f ms  %5.1fx" % (name, best * 1e3, baseline / best))
+
+
+if __name__ == "__main__":
+    main()
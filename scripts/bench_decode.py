@@ -0,0 +1,65 @@
+#! /usr/bin/env python
+
+"""
+Benchmark of the JSON decoders available to pyTD (see pyTD.utils.decoders)
+on synthetic option chain and price history payloads
+
+Usage: python scripts/bench_decode.py [--repeat N]
+"""
+import argparse
+import json
+import timeit
+
+from pyTD.utils.decoders import DECODERS
+
+
+def option_chain(expirations=20, strikes=200):
+    contract = {"putCall": "CALL", "symbol": "SPX_011919C2500",
+                "description": "SPX Jan 18 2019 2500 Call", "bid": 12.5,
+                "ask": 13.1, "last": 12.8, "mark": 12.8, "bidSize": 10,
+                "askSize": 12, "totalVolume": 1520, "volatility": 18.2,
+                "delta": 0.52, "gamma": 0.01, "theta": -0.8, "vega": 1.9,
+                "openInterest": 20013, "strikePrice": 2500.0,
+                "expirationDate": 1547845200000, "daysToExpiration": 30,
+                "inTheMoney": False, "mini": False, "nonStandard": False}
+    exp_map = {}
+    for e in range(expirations):
+        exp_map["2019-%02d-18:%d" % (e % 12 + 1, e)] = {
+            "%.1f" % (2000 + 5 * s): [dict(contract)]
+            for s in range(strikes)}
+    return {"symbol": "SPX", "status": "SUCCESS",
+            "callExpDateMap": exp_map, "putExpDateMap": exp_map}
+
+
+def candles(count=100000):
+    return {"symbol": "AAPL", "empty": False,
+            "candles": [{"open": 150.0 + i % 7, "high": 151.25,
+                         "low": 149.5, "close": 150.75, "volume": 1000 + i,
+                         "datetime": 1514872800000 + 60000 * i}
+                        for i in range(count)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {"option chain": option_chain(), "candles": candles()}
+    for name, payload in payloads.items():
+        data = json.dumps(payload).encode("utf-8")
+        print("%s (%.1f MB)" % (name, len(data) / 1e6))
+        baseline = None
+        for decoder_name in ("json", "ujson", "orjson"):
+            decoder = DECODERS.get(decoder_name)
+            if decoder is None:
+                print("  %-8s not installed" % decoder_name)
+                continue
+            best = min(timeit.repeat(lambda: decoder(data), number=1,
+                                     repeat=args.repeat))
+            baseline = baseline or best
+            print("  %-8s %8.1f ms  %5.1fx" % (decoder_name, best * 1e3,
+                                               baseline / best))
+
+
+if __name__ == "__main__":
+    main()